@@ -0,0 +1,304 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import typing as t
+
+from broker_rest_client.concurrency import execute_concurrently
+from broker_rest_client.deadline import Deadline, OperationCancelled
+from broker_rest_client.models import RabbitMQUserPermissions, RabbitMQQueueSpec
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+Resource = t.Tuple[str, str]
+
+
+class BatchOperation:
+
+    def __init__(self,
+                 method: str,
+                 kwargs: t.Dict[str, t.Any],
+                 provides: t.Optional[Resource] = None,
+                 requires: t.Optional[t.List[Resource]] = None) -> None:
+        """
+        A recorded call of a RabbitMQRestClient method
+        :param method: the name of the client method to be called
+        :param kwargs: the keyword arguments of the call
+        :param provides: the resource created by the call, i.e. ('queue', 'name')
+        :param requires: the resources that should exist before the call is made
+        """
+        self.method = method
+        self.kwargs = kwargs
+        self.provides = provides
+        self.requires = requires or []
+
+    @property
+    def key(self) -> t.Tuple:
+        return self.method, _freeze(self.kwargs)
+
+    def __repr__(self):
+        args = ", ".join(f"{name}={value!r}" for name, value in self.kwargs.items())
+        return f"{self.method}({args})"
+
+
+class BatchResult:
+
+    def __init__(self, operation: BatchOperation, error: t.Optional[Exception] = None, skipped: bool = False) -> None:
+        """
+        :param operation:
+        :param error: the error raised by the operation if it failed, OperationCancelled if it was not run because
+                      the deadline had passed
+        :param skipped: indicates whether the operation was not run because an operation it depends on failed
+        """
+        self.operation = operation
+        self.error = error
+        self.skipped = skipped
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None and not self.skipped
+
+    @property
+    def cancelled(self) -> bool:
+        return isinstance(self.error, OperationCancelled)
+
+    def __repr__(self):
+        status = 'skipped' if self.skipped else 'cancelled' if self.cancelled else 'failed' if self.error else \
+            'succeeded'
+        return f"<BatchResult {self.operation!r}: {status}>"
+
+
+class Batch:
+
+    def __init__(self,
+                 client,
+                 max_workers: int = 8,
+                 progress: t.Optional[t.Callable[[BatchResult], None]] = None,
+                 timeout: t.Optional[float] = None) -> None:
+        """
+        Records topology operations and runs them on exit of the `with` block. Duplicate operations are dropped and
+        the rest run level by level: operations that do not depend on each other run concurrently, while bindings
+        wait for their topic and queue and permissions wait for their user. An operation is skipped if any
+        operation it depends on failed.
+
+        Usage:
+            with client.batch() as batch:
+                batch.bind_queue_to_topic('queue', 'key', topic='topic')
+                batch.create_queue('queue')
+                batch.create_topic('topic')
+
+            failed = batch.failed
+
+        :param client: a RabbitMQRestClient
+        :param max_workers: the maximum number of concurrent requests
+        :param progress: called with the result of every operation as soon as it is known
+        :param timeout: the time budget in seconds of the whole execution, see broker_rest_client.deadline.Deadline.
+                        The operations that were not started in time are reported as cancelled.
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.progress = progress
+        self.timeout = timeout
+        self.operations: t.List[BatchOperation] = []
+        self.results: t.List[BatchResult] = []
+        self._keys = set()
+
+    def __enter__(self) -> 'Batch':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        if exc_type is None:
+            self.execute()
+
+        return False
+
+    @property
+    def failed(self) -> t.List[BatchResult]:
+        return [result for result in self.results if not result.succeeded]
+
+    @property
+    def cancelled(self) -> t.List[BatchResult]:
+        return [result for result in self.results if result.cancelled]
+
+    def _record(self, operation: BatchOperation) -> None:
+        if operation.key in self._keys:
+            return
+
+        self._keys.add(operation.key)
+        self.operations.append(operation)
+
+    def create_topic(self, name: str, durable: t.Optional[bool] = False, auto_delete: t.Optional[bool] = False) -> None:
+        self._record(BatchOperation('create_topic',
+                                    kwargs=dict(name=name, durable=durable, auto_delete=auto_delete),
+                                    provides=('exchange', name)))
+
+    def create_exchange(self,
+                        name: str,
+                        exchange_type: str,
+                        durable: t.Optional[bool] = False,
+                        auto_delete: t.Optional[bool] = False,
+                        arguments: t.Optional[t.Dict[str, t.Any]] = None) -> None:
+        self._record(BatchOperation('create_exchange',
+                                    kwargs=dict(name=name, exchange_type=exchange_type, durable=durable,
+                                                auto_delete=auto_delete, arguments=arguments),
+                                    provides=('exchange', name)))
+
+    def create_queue(self,
+                     name: str,
+                     max_length: t.Optional[int] = None,
+                     durable: t.Optional[bool] = False,
+                     auto_delete: t.Optional[bool] = False,
+                     spec: t.Optional[RabbitMQQueueSpec] = None,
+                     node: t.Optional[str] = None) -> None:
+        """
+        :raises: ValueError if the spec is not valid, including with `max_length`
+        """
+        kwargs = dict(name=name, max_length=max_length, durable=durable, auto_delete=auto_delete)
+
+        if spec is not None:
+            spec = spec.with_max_length(max_length or None)
+            spec.validate()
+            kwargs.update(max_length=None, spec=spec)
+
+        if node is not None:
+            kwargs['node'] = node
+
+        self._record(BatchOperation('create_queue', kwargs=kwargs, provides=('queue', name)))
+
+    def bind_queue_to_topic(self,
+                            queue: str,
+                            key: str,
+                            topic: str = 'default',
+                            durable: t.Optional[bool] = False) -> None:
+        if topic == 'default':
+            topic = 'amq.topic'
+
+        self._record(BatchOperation('bind_queue_to_topic',
+                                    kwargs=dict(queue=queue, key=key, topic=topic, durable=durable),
+                                    requires=[('exchange', topic), ('queue', queue)]))
+
+    def add_user(self, name: str, password: str, permissions: RabbitMQUserPermissions,
+                 tags: t.Optional[t.List[str]] = None) -> None:
+        self.create_user(name, password, tags)
+        self.set_user_permissions(name, permissions)
+
+    def create_user(self, name: str, password: str, tags: t.Optional[t.List[str]] = None) -> None:
+        self._record(BatchOperation('create_user',
+                                    kwargs=dict(name=name, password=password, tags=tags or []),
+                                    provides=('user', name)))
+
+    def set_user_permissions(self, name: str, permissions: RabbitMQUserPermissions) -> None:
+        self._record(BatchOperation('set_user_permissions',
+                                    kwargs=dict(name=name, permissions=permissions),
+                                    requires=[('user', name)]))
+
+    def create_policy(self, name: str, pattern: str, priority: int, apply_to: str, definitions: t.Dict[str, t.Any]):
+        self._record(BatchOperation('create_policy',
+                                    kwargs=dict(name=name, pattern=pattern, priority=priority, apply_to=apply_to,
+                                                definitions=definitions)))
+
+    def get_levels(self) -> t.List[t.List[BatchOperation]]:
+        """
+        Groups the recorded operations in levels so that every operation comes after the operations it depends on.
+        Requirements that are not provided by any operation of the batch are assumed to already exist in the broker.
+        :return:
+        """
+        providers = {}
+        for operation in self.operations:
+            if operation.provides is not None:
+                providers.setdefault(operation.provides, []).append(operation)
+
+        depths = {}
+
+        def depth(operation: BatchOperation) -> int:
+            if id(operation) not in depths:
+                dependencies = [provider
+                                for resource in operation.requires
+                                for provider in providers.get(resource, [])]
+
+                depths[id(operation)] = 1 + max((depth(d) for d in dependencies), default=-1)
+
+            return depths[id(operation)]
+
+        for operation in self.operations:
+            depth(operation)
+
+        levels = [[] for _ in range(max(depths.values(), default=-1) + 1)]
+        for operation in self.operations:
+            levels[depths[id(operation)]].append(operation)
+
+        return levels
+
+    def execute(self) -> t.List[BatchResult]:
+        """
+        Runs the recorded operations
+        :return: the result of every operation
+        """
+        deadline = Deadline.within(self.timeout)
+        failed_resources = set()
+        self.results = []
+
+        for level in self.get_levels():
+            runnable = []
+            for operation in level:
+                if failed_resources.intersection(operation.requires):
+                    self._add_result(BatchResult(operation, skipped=True))
+                    if operation.provides is not None:
+                        failed_resources.add(operation.provides)
+                else:
+                    runnable.append(operation)
+
+            outcomes = execute_concurrently(self._run, runnable, max_workers=self.max_workers, deadline=deadline)
+
+            for operation, _, error in outcomes:
+                self._add_result(BatchResult(operation, error=error))
+                if error is not None and operation.provides is not None:
+                    failed_resources.add(operation.provides)
+
+        return self.results
+
+    def _add_result(self, result: BatchResult) -> None:
+        self.results.append(result)
+
+        if self.progress is not None:
+            self.progress(result)
+
+    def _run(self, operation: BatchOperation) -> None:
+        getattr(self.client, operation.method)(**operation.kwargs)
+
+
+def _freeze(value: t.Any) -> t.Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    if hasattr(value, '__dict__'):
+        return type(value).__name__, _freeze(vars(value))
+
+    return value
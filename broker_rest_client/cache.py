@@ -0,0 +1,264 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import os
+import sqlite3
+import stat
+import threading
+import time
+import typing as t
+
+from broker_rest_client.transport import JSONSerializer
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, expires_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS invalidations (
+    key TEXT PRIMARY KEY, is_prefix INTEGER NOT NULL, invalidated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_expiry ON entries (expires_at);
+CREATE INDEX IF NOT EXISTS invalidations_by_time ON invalidations (invalidated_at);
+"""
+
+# refuses values fetched before the key (or a prefix of it) was last invalidated
+_SET_IF_NOT_INVALIDATED = """
+INSERT OR REPLACE INTO entries (key, expires_at, value)
+SELECT :key, :expires_at, :value
+WHERE NOT EXISTS (
+    SELECT 1 FROM invalidations
+    WHERE invalidated_at >= :fetched_at AND (key = :key OR (is_prefix AND substr(:key, 1, length(key)) = key))
+)
+"""
+
+
+def get_default_path() -> str:
+    """
+    :return: a file in a directory that only the current user can access, i.e. '~/.cache/broker-rest-client/'
+    :raises: PermissionError if the directory belongs to another user or is accessible by other users
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    directory = os.path.join(base, 'broker-rest-client')
+
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    info = os.lstat(directory)
+    if hasattr(os, 'getuid'):
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+            raise PermissionError(f'{directory} does not belong to the current user')
+        if info.st_mode & 0o077:
+            os.chmod(directory, 0o700)
+
+    return os.path.join(directory, 'cache.sqlite3')
+
+
+class SharedCache:
+
+    def __init__(self,
+                 path: t.Optional[str] = None,
+                 ttl: float = 30.0,
+                 namespace: str = '',
+                 lease_timeout: float = 5.0,
+                 serializer: t.Optional[JSONSerializer] = None) -> None:
+        """
+        A cache stored in a SQLite file that can be shared by all the processes of a host, i.e. the workers of a
+        gunicorn application. Entries expire after `ttl` seconds. When several processes miss the same key at the
+        same time only one of them fetches it while the others wait for its result.
+
+        :param path: the SQLite file, defaults to a file that only the current user can access, see get_default_path
+        :param ttl: the default time to live of the entries in seconds
+        :param namespace: prefixed to every key. RabbitMQRestClient prefixes its keys with the URL of the broker too.
+        :param lease_timeout: the time in seconds a process waits for another one to fill a missing key
+        :param serializer: encodes the cached values, defaults to the stdlib json module
+        """
+        self.path = path or get_default_path()
+        self.ttl = ttl
+        self.namespace = namespace
+        self.lease_timeout = lease_timeout
+        self.serializer = serializer or JSONSerializer()
+
+        self._local = threading.local()
+        self._next_purge_at = 0.0
+
+        with self._connection as connection:
+            connection.executescript(_SCHEMA)
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections can be shared neither among threads nor forked processes
+        pid = os.getpid()
+
+        if getattr(self._local, 'pid', None) != pid:
+            connection = sqlite3.connect(self.path, timeout=self.lease_timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+
+            self._local.connection = connection
+            self._local.pid = pid
+
+        return self._local.connection
+
+    def _key(self, key: str) -> str:
+        return f'{self.namespace}{key}'
+
+    @property
+    def _invalidation_horizon(self) -> float:
+        """
+        Invalidations older than this are pruned, so values fetched before it are not stored since the invalidation
+        that made them stale may be gone.
+        """
+        return time.time() - self.lease_timeout - self.ttl
+
+    def _purge_expired(self, now: float) -> None:
+        # at most once per ttl and process
+        if now < self._next_purge_at:
+            return
+
+        self._next_purge_at = now + self.ttl
+        self._connection.execute('DELETE FROM entries WHERE expires_at <= ?', (now,))
+
+    def get(self, key: str) -> t.Optional[t.Any]:
+        """
+        :param key:
+        :return: the cached value or None if it is missing or expired
+        """
+        row = self._connection.execute('SELECT value FROM entries WHERE key = ? AND expires_at > ?',
+                                       (self._key(key), time.time())).fetchone()
+
+        return None if row is None else self.serializer.loads(row[0])
+
+    def set(self, key: str, value: t.Any, ttl: t.Optional[float] = None, fetched_at: t.Optional[float] = None) -> bool:
+        """
+        :param key:
+        :param value:
+        :param ttl: overrides the default time to live
+        :param fetched_at: the time (time.time()) the value was read at. The value is not stored if the key was
+                           invalidated since then, since it may predate the write that invalidated it, nor if it was
+                           read more than `lease_timeout + ttl` seconds ago.
+        :return: whether the value was stored
+        """
+        now = time.time()
+        self._purge_expired(now)
+
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        params = {'key': self._key(key), 'expires_at': expires_at, 'value': self.serializer.dumps(value)}
+
+        if fetched_at is None:
+            self._connection.execute('INSERT OR REPLACE INTO entries (key, expires_at, value) '
+                                     'VALUES (:key, :expires_at, :value)', params)
+            return True
+
+        if fetched_at < self._invalidation_horizon:
+            return False
+
+        cursor = self._connection.execute(_SET_IF_NOT_INVALIDATED, dict(params, fetched_at=fetched_at))
+
+        return cursor.rowcount == 1
+
+    def _record_invalidation(self, keys: t.List[str], is_prefix: bool) -> None:
+        now = time.time()
+
+        self._connection.execute('DELETE FROM invalidations WHERE invalidated_at < ?', (self._invalidation_horizon,))
+        self._connection.executemany('INSERT OR REPLACE INTO invalidations (key, is_prefix, invalidated_at) '
+                                     'VALUES (?, ?, ?)', [(key, int(is_prefix), now) for key in keys])
+
+    def invalidate(self, *keys: str) -> None:
+        keys = [self._key(key) for key in keys]
+
+        # recorded first so that a fetch racing with the deletion cannot store its result
+        self._record_invalidation(keys, is_prefix=False)
+        self._connection.executemany('DELETE FROM entries WHERE key = ?', [(key,) for key in keys])
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """
+        Invalidates every key starting with `prefix`
+        :param prefix:
+        """
+        prefix = self._key(prefix)
+
+        self._record_invalidation([prefix], is_prefix=True)
+        self._connection.execute('DELETE FROM entries WHERE key >= ? AND key < ?', (prefix, prefix + '\U0010ffff'))
+
+    def clear(self) -> None:
+        self.invalidate_prefix('')
+
+    def _acquire_lease(self, key: str) -> bool:
+        now = time.time()
+        connection = self._connection
+
+        connection.execute('DELETE FROM leases WHERE key = ? AND expires_at <= ?', (key, now))
+        cursor = connection.execute('INSERT OR IGNORE INTO leases (key, expires_at) VALUES (?, ?)',
+                                    (key, now + self.lease_timeout))
+
+        return cursor.rowcount == 1
+
+    def _release_lease(self, key: str) -> None:
+        self._connection.execute('DELETE FROM leases WHERE key = ?', (key,))
+
+    def get_or_set(self, key: str, fetch: t.Callable[[], t.Any], ttl: t.Optional[float] = None) -> t.Any:
+        """
+        Returns the cached value of `key` or calls `fetch` and caches its result. Errors raised by `fetch` are not
+        cached.
+        :param key:
+        :param fetch:
+        :param ttl: overrides the default time to live
+        :return:
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        lease_key = self._key(key)
+
+        if not self._acquire_lease(lease_key):
+            deadline = time.monotonic() + self.lease_timeout
+
+            while time.monotonic() < deadline:
+                time.sleep(0.01)
+
+                value = self.get(key)
+                if value is not None:
+                    return value
+
+                if self._acquire_lease(lease_key):
+                    break
+            else:
+                return fetch()
+
+        try:
+            fetched_at = time.time()
+            value = fetch()
+            if value is not None:
+                self.set(key, value, ttl, fetched_at=fetched_at)
+
+            return value
+        finally:
+            self._release_lease(lease_key)
@@ -0,0 +1,429 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import argparse
+import json
+import os
+import sys
+import typing as t
+from contextlib import nullcontext
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover
+    yaml = None
+
+from broker_rest_client.batch import BatchResult
+from broker_rest_client.concurrency import execute_concurrently, DEFAULT_CONCURRENCY
+from broker_rest_client.deadline import Deadline, DeadlineExceeded, OperationCancelled
+from broker_rest_client.models import RabbitMQUserPermissions, RabbitMQQueueSpec, RabbitMQMessage
+from broker_rest_client.rabbitmq_rest_client import RabbitMQRestClient
+from broker_rest_client.snapshot import TopologySnapshot
+from broker_rest_client.stats import ThroughputStats
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+TOPOLOGY_FORMAT = """
+The topology file (YAML or JSON) looks like:
+
+    exchanges:
+      - {name: orders, type: topic, durable: true}
+    queues:
+      - {name: orders.eu, durable: true, max_length: 1000}
+      - {name: orders.us, profile: replicated-quorum}
+      - {name: audit, spec: {queue_type: stream, max_length_bytes: 1000000}}
+    bindings:
+      - {queue: orders.eu, exchange: orders, routing_key: eu.#}
+    users:
+      - {name: app, password: secret, tags: [management], permissions: {configure: '', write: '.*', read: '.*'}}
+    policies:
+      - {name: ttl, pattern: '^orders', priority: 1, apply_to: queues, definition: {message-ttl: 60000}}
+
+Commands print a JSON summary on stdout (except `export` without --output) and their progress on stderr.
+"""
+
+
+def load_topology(path: str) -> t.Dict[str, t.List[t.Dict[str, t.Any]]]:
+    """
+    :param path: a .json, .yml or .yaml file
+    :raises: ValueError if YAML is used without PyYAML being installed
+    """
+    with open(path) as f:
+        if path.endswith('.json'):
+            return json.load(f) or {}
+
+        if yaml is None:
+            raise ValueError('PyYAML is required for YAML topology files: pip install pyyaml')
+
+        return yaml.safe_load(f) or {}
+
+
+def dump_topology(topology: t.Dict[str, t.Any], path: t.Optional[str] = None) -> None:
+    if path is not None and not path.endswith('.json'):
+        if yaml is None:
+            raise ValueError('PyYAML is required for YAML topology files: pip install pyyaml')
+
+        with open(path, 'w') as f:
+            yaml.safe_dump(topology, f, sort_keys=False)
+        return
+
+    content = json.dumps(topology, indent=2)
+
+    if path is None:
+        print(content)
+    else:
+        with open(path, 'w') as f:
+            f.write(content)
+
+
+class SkippedError(Exception):
+    pass
+
+
+def _get_exchange_name(name: str) -> str:
+    return 'amq.topic' if name == 'default' else name
+
+
+def _get_queue_spec(queue: t.Dict[str, t.Any]) -> t.Optional[RabbitMQQueueSpec]:
+    if 'profile' in queue:
+        return RabbitMQQueueSpec.from_profile(queue['profile'], **queue.get('spec', {}))
+    if 'spec' in queue:
+        return RabbitMQQueueSpec(**queue['spec'])
+
+    return None
+
+
+class Progress:
+
+    def __init__(self, command: str, total: t.Optional[int] = None, enabled: bool = True) -> None:
+        """
+        Reports the progress of a command on stderr
+        """
+        self.command = command
+        self.total = total
+        self.enabled = enabled
+        self.stats = ThroughputStats()
+
+    def update(self, item: t.Any = None, error: t.Optional[Exception] = None) -> None:
+        """
+        :param item: the processed item
+        :param error: the reason why the item failed, if it did
+        """
+        if error is None:
+            self.stats.add()
+        elif isinstance(error, OperationCancelled):
+            self.stats.add_cancelled(item)
+        else:
+            self.stats.add_error(item, error)
+
+        if self.enabled:
+            done = self.stats.count + len(self.stats.errors) + len(self.stats.cancelled)
+            total = f'/{self.total}' if self.total is not None else ''
+            sys.stderr.write(f'\r[{self.command}] {done}{total} errors={len(self.stats.errors)} '
+                             f'({self.stats.rate:.1f}/s)')
+            sys.stderr.flush()
+
+    def finish(self) -> ThroughputStats:
+        self.stats.finish()
+
+        if self.enabled:
+            sys.stderr.write('\n')
+
+        return self.stats
+
+
+def _get_summary(command: str, stats: ThroughputStats, **extra) -> t.Dict[str, t.Any]:
+    return dict({
+        'command': command,
+        'count': stats.count,
+        'errors': [{'item': str(item), 'error': str(error)} for item, error in stats.errors],
+        'cancelled': len(stats.cancelled),
+        'elapsed': round(stats.elapsed, 3),
+        'rate': round(stats.rate, 1),
+    }, **extra)
+
+
+def apply_topology(client: RabbitMQRestClient,
+                   topology: t.Dict[str, t.List[t.Dict[str, t.Any]]],
+                   concurrency: int = DEFAULT_CONCURRENCY,
+                   progress: t.Optional[Progress] = None) -> t.Dict[str, t.Any]:
+    """
+    Declares the topology with a single batch, see RabbitMQRestClient.batch
+    :return: the summary
+    :raises: ValueError if a queue spec is not valid
+    """
+    progress = progress or Progress('apply', enabled=False)
+
+    def on_result(result: BatchResult) -> None:
+        error = result.error or (SkippedError('a required operation failed') if result.skipped else None)
+        progress.update(result.operation, error)
+
+    batch = client.batch(max_workers=concurrency, progress=on_result)
+
+    for exchange in topology.get('exchanges', []):
+        batch.create_exchange(exchange['name'],
+                              exchange.get('type', 'topic'),
+                              durable=exchange.get('durable', False),
+                              auto_delete=exchange.get('auto_delete', False),
+                              arguments=exchange.get('arguments'))
+
+    for queue in topology.get('queues', []):
+        batch.create_queue(queue['name'],
+                           max_length=queue.get('max_length'),
+                           durable=queue.get('durable', False),
+                           auto_delete=queue.get('auto_delete', False),
+                           spec=_get_queue_spec(queue))
+
+    for binding in topology.get('bindings', []):
+        batch.bind_queue_to_topic(binding['queue'],
+                                  binding['routing_key'],
+                                  topic=binding.get('exchange', 'default'),
+                                  durable=binding.get('durable', False))
+
+    for user in topology.get('users', []):
+        batch.create_user(user['name'], user['password'], user.get('tags'))
+
+        if 'permissions' in user:
+            batch.set_user_permissions(user['name'], RabbitMQUserPermissions(**user['permissions']))
+
+    for policy in topology.get('policies', []):
+        batch.create_policy(policy['name'],
+                            policy['pattern'],
+                            policy.get('priority', 0),
+                            policy.get('apply_to', 'all'),
+                            policy.get('definition', {}))
+
+    progress.total = len(batch.operations)
+
+    batch.execute()
+
+    return _get_summary('apply', progress.finish(), total=len(batch.operations))
+
+
+def _get_keys(topology: t.Dict[str, t.List[t.Dict[str, t.Any]]]) -> t.Dict[str, t.Set]:
+    return {
+        'exchanges': {exchange['name'] for exchange in topology.get('exchanges', [])},
+        'queues': {queue['name'] for queue in topology.get('queues', [])},
+        'bindings': {(_get_exchange_name(binding.get('exchange', 'default')), binding['queue'], binding['routing_key'])
+                     for binding in topology.get('bindings', [])},
+        'policies': {policy['name'] for policy in topology.get('policies', [])},
+    }
+
+
+def export_topology(snapshot: TopologySnapshot) -> t.Dict[str, t.List[t.Dict[str, t.Any]]]:
+    """
+    Converts a snapshot to the topology file format. Users are not exported since their passwords are unknown and
+    the default exchanges as well as the implicit bindings of the default exchange are left out.
+    """
+    return {
+        'exchanges': [
+            {'name': e['name'], 'type': e['type'], 'durable': e['durable'], 'auto_delete': e['auto_delete'],
+             'arguments': e['arguments']}
+            for e in snapshot.iter_rows('exchanges') if e['name'] and not e['name'].startswith('amq.')
+        ],
+        'queues': [
+            {'name': q['name'],
+             'spec': {'queue_type': q['type'] or 'classic', 'durable': q['durable'], 'auto_delete': q['auto_delete'],
+                      'arguments': {k: v for k, v in q['arguments'].items() if k != 'x-queue-type'}}}
+            for q in snapshot.iter_rows('queues')
+        ],
+        'bindings': [
+            {'queue': b['destination'], 'exchange': b['source'], 'routing_key': b['routing_key']}
+            for b in snapshot.iter_rows('bindings') if b['source'] and b['destination_type'] == 'queue'
+        ],
+        'policies': [
+            {'name': p['name'], 'pattern': p['pattern'], 'priority': p['priority'], 'apply_to': p['apply-to'],
+             'definition': p['definition']}
+            for p in snapshot.iter_rows('policies')
+        ],
+    }
+
+
+def diff_topology(topology: t.Dict[str, t.List[t.Dict[str, t.Any]]],
+                  snapshot: TopologySnapshot) -> t.Dict[str, t.Any]:
+    """
+    Compares a topology file with the broker by name (and by exchange, queue and routing key for bindings)
+    :return: the objects missing from the broker and the ones that exist in the broker only
+    """
+    desired, actual = _get_keys(topology), _get_keys(export_topology(snapshot))
+
+    def sort(keys):
+        return sorted(list(key) if isinstance(key, tuple) else key for key in keys)
+
+    return {
+        'command': 'diff',
+        'missing': {kind: sort(desired[kind] - actual[kind]) for kind in desired},
+        'extra': {kind: sort(actual[kind] - desired[kind]) for kind in desired},
+    }
+
+
+def purge_queues(client: RabbitMQRestClient,
+                 queues: t.List[str],
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 progress: t.Optional[Progress] = None) -> t.Dict[str, t.Any]:
+    progress = progress or Progress('purge', enabled=False)
+    progress.total = len(queues)
+
+    outcomes = execute_concurrently(client.purge_queue, queues, max_workers=concurrency, deadline=Deadline.current())
+
+    for queue, _, error in outcomes:
+        progress.update(queue, error)
+
+    return _get_summary('purge', progress.finish())
+
+
+def bench(client: RabbitMQRestClient,
+          exchange: str,
+          routing_key: str,
+          count: int,
+          size: int,
+          concurrency: int = DEFAULT_CONCURRENCY,
+          queue: t.Optional[str] = None) -> t.Dict[str, t.Any]:
+    """
+    Publishes `count` messages of `size` bytes and, if a queue is given, retrieves them back
+    """
+    payload = 'x' * size
+    messages = (RabbitMQMessage(payload, routing_key=routing_key) for _ in range(count))
+
+    publish_stats = client.publish_many(exchange, messages, concurrency=concurrency)
+    summary = _get_summary('bench', publish_stats, unroutable=len(publish_stats.unroutable))
+
+    if queue is not None:
+        get_stats = ThroughputStats()
+        try:
+            for _ in client.get_messages(queue, count, stats=get_stats):
+                pass
+        except DeadlineExceeded as e:
+            get_stats.add_error(queue, e)
+            get_stats.finish()
+
+        summary['get'] = _get_summary('get', get_stats)
+
+    return summary
+
+
+def create_client(args: argparse.Namespace) -> RabbitMQRestClient:
+    return RabbitMQRestClient.create(host=args.host,
+                                     https=args.https,
+                                     username=args.username,
+                                     password=args.password,
+                                     verify=args.verify,
+                                     timeout=args.timeout,
+                                     vhost=args.vhost)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='broker-rest-client',
+                                     description='Bulk RabbitMQ topology operations',
+                                     epilog=TOPOLOGY_FORMAT,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=os.environ.get('BROKER_HOST', 'localhost:15672'))
+    parser.add_argument('--username', default=os.environ.get('BROKER_USERNAME', 'guest'))
+    parser.add_argument('--password', default=os.environ.get('BROKER_PASSWORD', 'guest'))
+    parser.add_argument('--vhost', default=os.environ.get('BROKER_VHOST', '/'))
+    parser.add_argument('--https', action='store_true')
+    parser.add_argument('--no-verify', dest='verify', action='store_false')
+    parser.add_argument('--timeout', type=float, default=30, help='the timeout of every request in seconds')
+    parser.add_argument('--deadline', type=float, help='the time budget of the whole command in seconds. The work '
+                                                       'that is not started in time is cancelled and reported.')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='the maximum number of concurrent requests, at most the connection pool size')
+    parser.add_argument('--quiet', action='store_true', help='do not report progress')
+
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    apply_parser = commands.add_parser('apply', help='declares the topology of a file')
+    apply_parser.add_argument('file')
+
+    diff_parser = commands.add_parser('diff', help='compares the topology of a file with the broker')
+    diff_parser.add_argument('file')
+
+    export_parser = commands.add_parser('export', help='writes the topology of the vhost')
+    export_parser.add_argument('-o', '--output', help='a .json, .yml or .yaml file. Defaults to JSON on stdout')
+
+    purge_parser = commands.add_parser('purge', help='deletes the messages of queues')
+    purge_parser.add_argument('queues', nargs='*')
+    purge_parser.add_argument('-f', '--file', help='purges the queues of a topology file')
+
+    bench_parser = commands.add_parser('bench', help='measures the publish (and get) throughput')
+    bench_parser.add_argument('--exchange', default='amq.topic')
+    bench_parser.add_argument('--routing-key', default='bench')
+    bench_parser.add_argument('--count', type=int, default=1000)
+    bench_parser.add_argument('--size', type=int, default=100)
+    bench_parser.add_argument('--queue', help='retrieves the published messages from this queue')
+
+    return parser
+
+
+def run(args: argparse.Namespace, client: RabbitMQRestClient) -> t.Dict[str, t.Any]:
+    if args.command == 'apply':
+        progress = Progress('apply', enabled=not args.quiet)
+        return apply_topology(client, load_topology(args.file), concurrency=args.concurrency, progress=progress)
+
+    if args.command == 'diff':
+        return diff_topology(load_topology(args.file), client.get_snapshot())
+
+    if args.command == 'export':
+        topology = export_topology(client.get_snapshot())
+        dump_topology(topology, args.output)
+        return {'command': 'export', **{kind: len(items) for kind, items in topology.items()}}
+
+    if args.command == 'purge':
+        queues = list(args.queues)
+        if args.file:
+            queues += [queue['name'] for queue in load_topology(args.file).get('queues', [])]
+
+        progress = Progress('purge', enabled=not args.quiet)
+        return purge_queues(client, queues, concurrency=args.concurrency, progress=progress)
+
+    return bench(client, args.exchange, args.routing_key, args.count, args.size,
+                 concurrency=args.concurrency, queue=args.queue)
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> int:
+    args = get_parser().parse_args(argv)
+
+    client = create_client(args)
+
+    with Deadline.within(args.deadline) or nullcontext():
+        summary = run(args, client)
+
+    # export writes the topology on stdout unless an output file is given
+    if args.command != 'export' or args.output:
+        print(json.dumps(summary))
+
+    failed = summary.get('errors') or summary.get('cancelled') or any((summary.get('missing') or {}).values())
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import itertools
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from broker_rest_client.deadline import Deadline, OperationCancelled
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+# the size of the connection pool of requests (requests.adapters.DEFAULT_POOLSIZE). Concurrent requests beyond it open
+# connections that are discarded afterwards instead of being reused.
+DEFAULT_CONCURRENCY = 10
+
+# (item, result, error)
+Outcome = t.Tuple[t.Any, t.Any, t.Optional[Exception]]
+
+
+def execute_concurrently(func: t.Callable[[t.Any], t.Any],
+                         items: t.Iterable[t.Any],
+                         max_workers: int = 8,
+                         deadline: t.Optional[Deadline] = None) -> t.Iterator[Outcome]:
+    """
+    Applies `func` on every item using a pool of threads and yields the outcomes in completion order. At most
+    `max_workers` calls are in flight at any time so that `items` can be a (possibly very long) generator.
+    :param func: callable accepting one item
+    :param items: should be finite if a deadline is given
+    :param max_workers: the maximum number of concurrent calls
+    :param deadline: applies to the calls, in the worker threads. Once it has passed no more calls are started and the
+                     remaining items are yielded with an OperationCancelled error.
+    :return: tuples of (item, result, error) where error is None if the call succeeded
+    """
+    if max_workers < 1:
+        raise ValueError('max_workers should be a positive integer')
+
+    items = iter(items)
+
+    if deadline is not None:
+        func = _with_deadline(func, deadline)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+
+        for item in items:
+            if deadline is not None and deadline.expired:
+                yield from _cancel(item, items)
+                break
+
+            in_flight[executor.submit(func, item)] = item
+
+            if len(in_flight) >= max_workers:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                yield from _collect(done, in_flight)
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            yield from _collect(done, in_flight)
+
+
+def _with_deadline(func: t.Callable[[t.Any], t.Any], deadline: Deadline) -> t.Callable[[t.Any], t.Any]:
+    def run(item):
+        with deadline:
+            return func(item)
+
+    return run
+
+
+def _cancel(item, items):
+    for cancelled in itertools.chain([item], items):
+        yield cancelled, None, OperationCancelled('The deadline passed before the operation started')
+
+
+def _collect(done, in_flight):
+    for future in done:
+        item = in_flight.pop(future)
+        error = future.exception()
+
+        yield item, None if error else future.result(), error
+
+
+class RateLimiter:
+
+    def __init__(self, rate: float) -> None:
+        """
+        Spaces out calls so that at most `rate` of them start per second, across all threads
+        :param rate: calls per second
+        """
+        if rate <= 0:
+            raise ValueError('rate should be positive')
+
+        self.interval = 1.0 / rate
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Blocks until the next call is allowed
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
@@ -0,0 +1,157 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import re
+import time
+import typing as t
+from datetime import datetime, timedelta, timezone
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+# i.e. 'Z', '+02:00' or '-0500'
+_OFFSET = re.compile(r'(Z|[+-]\d{2}:?\d{2})$')
+
+
+def _parse_timestamp(value: str) -> t.Optional[float]:
+    """
+    Parses the timestamps of the management API, i.e. '2019-10-15 9:58:00'. They are in UTC unless they carry an
+    explicit offset.
+    :return: seconds since the epoch, None if the value cannot be parsed
+    """
+    value = value.strip()
+    tzinfo = timezone.utc
+
+    match = _OFFSET.search(value)
+    if match is not None:
+        value, offset = value[:match.start()], match.group(1)
+
+        if offset != 'Z':
+            digits = offset[1:].replace(':', '')
+            delta = timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+            tzinfo = timezone(-delta if offset[0] == '-' else delta)
+
+    # fractional seconds are irrelevant to idle times
+    value = value.split('.')[0]
+
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S'):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=tzinfo).timestamp()
+        except ValueError:
+            continue
+
+    return None
+
+
+class ConnectionFilter:
+
+    def __init__(self,
+                 user: t.Optional[str] = None,
+                 vhost: t.Optional[str] = None,
+                 min_idle: t.Optional[float] = None,
+                 min_channels: t.Optional[int] = None,
+                 max_channels: t.Optional[int] = None,
+                 client_properties: t.Optional[t.Dict[str, t.Any]] = None) -> None:
+        """
+        Selects connections (or channels) from the management API listings. All the given criteria should match. The
+        channel count and client properties criteria only apply to connections.
+        :param user: the user the connection is authenticated as
+        :param vhost: the vhost of the connection
+        :param min_idle: the minimum time in seconds since the connection was last active
+        :param min_channels: the minimum number of open channels
+        :param max_channels: the maximum number of open channels, i.e. 0 for connections without channels
+        :param client_properties: the client properties to match, i.e. {'connection_name': 'worker-1'}
+        """
+        self.user = user
+        self.vhost = vhost
+        self.min_idle = min_idle
+        self.min_channels = min_channels
+        self.max_channels = max_channels
+        self.client_properties = client_properties or {}
+
+    @property
+    def connection_criteria(self) -> t.List[str]:
+        """
+        :return: the criteria given which channel objects cannot be matched against
+        """
+        criteria = []
+
+        if self.min_channels is not None:
+            criteria.append('min_channels')
+        if self.max_channels is not None:
+            criteria.append('max_channels')
+        if self.client_properties:
+            criteria.append('client_properties')
+
+        return criteria
+
+    @property
+    def columns(self) -> t.List[str]:
+        """
+        :return: the fields needed to evaluate the filter, besides the name
+        """
+        columns = ['name']
+
+        if self.user is not None:
+            columns.append('user')
+        if self.vhost is not None:
+            columns.append('vhost')
+        if self.min_idle is not None:
+            columns.append('idle_since')
+        if self.min_channels is not None or self.max_channels is not None:
+            columns.append('channels')
+        if self.client_properties:
+            columns.append('client_properties')
+
+        return columns
+
+    def matches(self, item: t.Dict[str, t.Any], now: t.Optional[float] = None) -> bool:
+        if self.user is not None and item.get('user') != self.user:
+            return False
+
+        if self.vhost is not None and item.get('vhost') != self.vhost:
+            return False
+
+        if self.min_idle is not None:
+            # items which are active have no 'idle_since'
+            idle_since = _parse_timestamp(item.get('idle_since') or '')
+            if idle_since is None or (now or time.time()) - idle_since < self.min_idle:
+                return False
+
+        channels = item.get('channels') or 0
+        if self.min_channels is not None and channels < self.min_channels:
+            return False
+        if self.max_channels is not None and channels > self.max_channels:
+            return False
+
+        properties = item.get('client_properties') or {}
+        if any(properties.get(key) != value for key, value in self.client_properties.items()):
+            return False
+
+        return True
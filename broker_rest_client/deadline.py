@@ -0,0 +1,202 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+import time
+import typing as t
+from contextlib import contextmanager
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+_local = threading.local()
+
+
+def _get_stack() -> t.List[t.Optional['Deadline']]:
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+
+    return _local.stack
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class OperationCancelled(DeadlineExceeded):
+    """
+    Reported for the items of a bulk operation that were not started because the deadline had passed
+    """
+    pass
+
+
+class Deadline:
+
+    def __init__(self, timeout: float) -> None:
+        """
+        An overall time budget shared by all the requests performed within its `with` block, in the current thread
+        and in the worker threads of the bulk operations started from it:
+
+            with Deadline(10):
+                client.delete_queue_binding('queue', 'topic', 'key')
+                client.add_user('user', 'password', permissions)
+
+        Every request is given the remaining time as its timeout and no request starts once the deadline has passed.
+        Nested deadlines cannot extend the enclosing one.
+        :param timeout: in seconds
+        """
+        self.expires_at = time.monotonic() + timeout
+
+    @classmethod
+    def current(cls) -> t.Optional['Deadline']:
+        """
+        :return: the deadline in effect in the current thread, if any
+        """
+        stack = _get_stack()
+
+        return stack[-1] if stack else None
+
+    @classmethod
+    def within(cls, timeout: t.Optional[float]) -> t.Optional['Deadline']:
+        """
+        :param timeout: in seconds, None for no other limit than the current deadline
+        :return: the earliest of a new deadline and the current one
+        """
+        current = cls.current()
+
+        if timeout is None:
+            return current
+
+        deadline = cls(timeout)
+
+        return current if current is not None and current.expires_at < deadline.expires_at else deadline
+
+    @property
+    def remaining(self) -> float:
+        """
+        :return: the time left in seconds, 0 once expired
+        """
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """
+        :raises: DeadlineExceeded if the deadline has passed
+        """
+        if self.expired:
+            raise DeadlineExceeded('The deadline has passed')
+
+    def get_timeout(self, timeout: t.Optional[float] = None) -> float:
+        """
+        :param timeout: the timeout requested for a single request, if any
+        :return: the timeout of the next request so that it ends before the deadline
+        :raises: DeadlineExceeded if the deadline has passed
+        """
+        self.check()
+
+        remaining = self.remaining
+
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def __enter__(self) -> 'Deadline':
+        current = self.current()
+
+        # an enclosing deadline that expires earlier stays in effect
+        if current is not None and current.expires_at < self.expires_at:
+            _get_stack().append(current)
+        else:
+            _get_stack().append(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        _get_stack().pop()
+
+        return False
+
+    def __repr__(self):
+        return f"<Deadline remaining={self.remaining:.3f}s>"
+
+
+@contextmanager
+def no_deadline() -> t.Iterator[None]:
+    """
+    Lifts the current deadline, i.e. for the clean up requests that should run even after it has passed
+    """
+    stack = _get_stack()
+    stack.append(None)
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+class DeadlineRequestHandler:
+
+    def __init__(self, request_handler) -> None:
+        """
+        Wraps a request handler so that the requests performed within a deadline get the remaining time as their
+        timeout and fail with DeadlineExceeded once it has passed. Requests outside a deadline are left untouched.
+        :param request_handler:
+        """
+        self._request_handler = request_handler
+
+    def request(self, method: str, url: str, **kwargs) -> t.Any:
+        deadline = Deadline.current()
+
+        if deadline is None:
+            return getattr(self._request_handler, method.lower())(url, **kwargs)
+
+        kwargs['timeout'] = deadline.get_timeout(kwargs.get('timeout'))
+
+        try:
+            return getattr(self._request_handler, method.lower())(url, **kwargs)
+        except Exception as e:
+            # i.e. the read timeout of the underlying library
+            if deadline.expired:
+                raise DeadlineExceeded(f'{method} {url} did not complete before the deadline') from e
+            raise
+
+    def get(self, url: str, **kwargs) -> t.Any:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> t.Any:
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> t.Any:
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> t.Any:
+        return self.request('DELETE', url, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self._request_handler, item)
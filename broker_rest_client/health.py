@@ -0,0 +1,155 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+import time
+import typing as t
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+class HealthCheckResult:
+
+    def __init__(self,
+                 name: str,
+                 healthy: bool,
+                 latency: float,
+                 checked_at: float,
+                 status_code: t.Optional[int] = None,
+                 details: t.Any = None,
+                 stale: bool = False) -> None:
+        """
+        :param name: the name of the check, i.e. 'aliveness'
+        :param healthy:
+        :param latency: the duration of the request in seconds
+        :param checked_at: the time of the request (seconds since the epoch)
+        :param status_code: None if no response was received
+        :param details: the body of the response or the error that occurred
+        :param stale: indicates whether the result was served from the cache while being refreshed
+        """
+        self.name = name
+        self.healthy = healthy
+        self.latency = latency
+        self.checked_at = checked_at
+        self.status_code = status_code
+        self.details = details
+        self.stale = stale
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.checked_at
+
+    def to_json(self):
+        return {
+            'name': self.name,
+            'healthy': self.healthy,
+            'latency': self.latency,
+            'checked_at': self.checked_at,
+            'status_code': self.status_code,
+            'stale': self.stale
+        }
+
+    def __repr__(self):
+        return f"<HealthCheckResult {self.name} healthy={self.healthy} latency={self.latency * 1000:.1f}ms " \
+               f"stale={self.stale}>"
+
+
+class HealthProbeCache:
+
+    def __init__(self, ttl: float = 5.0, stale_ttl: float = 30.0) -> None:
+        """
+        Caches probe results with stale-while-revalidate semantics: results younger than `ttl` are served as they
+        are, results younger than `ttl + stale_ttl` are served as stale while a single background refresh runs, and
+        older results are refreshed synchronously. Concurrent misses on the same key wait for a single probe.
+
+        :param ttl: the time in seconds during which a result is fresh
+        :param stale_ttl: the additional time in seconds during which a stale result may be served
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        self._results: t.Dict[str, HealthCheckResult] = {}
+        self._pending: t.Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, probe: t.Callable[[], HealthCheckResult]) -> HealthCheckResult:
+        """
+        :param key:
+        :param probe: performs the check. It should not raise.
+        :return:
+        """
+        while True:
+            with self._lock:
+                result = self._results.get(key)
+                age = result.age if result is not None else None
+
+                if age is not None and age < self.ttl:
+                    return result
+
+                pending = self._pending.get(key)
+
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+
+                    if age is not None and age < self.ttl + self.stale_ttl:
+                        threading.Thread(target=self._refresh, args=(key, probe, pending), daemon=True).start()
+                        return self._as_stale(result)
+
+                    break
+
+                if age is not None and age < self.ttl + self.stale_ttl:
+                    return self._as_stale(result)
+
+            pending.wait()
+
+        return self._refresh(key, probe, pending)
+
+    @staticmethod
+    def _as_stale(result: HealthCheckResult) -> HealthCheckResult:
+        return HealthCheckResult(**dict(vars(result), stale=True))
+
+    def _refresh(self,
+                 key: str,
+                 probe: t.Callable[[], HealthCheckResult],
+                 pending: threading.Event) -> HealthCheckResult:
+        try:
+            result = probe()
+
+            with self._lock:
+                self._results[key] = result
+
+            return result
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            pending.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
@@ -27,7 +27,7 @@ http://opensource.org/licenses/BSD-3-Clause
 
 Details on EUROCONTROL: http://www.eurocontrol.int
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from rest_client import BaseModel
 
@@ -67,3 +67,237 @@ class RabbitMQUser(BaseModel):
             name=user_dict['name'],
             tags=user_dict['tags'] if user_dict['tags'] else []
         )
+
+
+class RabbitMQMessage(BaseModel):
+
+    def __init__(self,
+                 payload: str,
+                 routing_key: str = '',
+                 properties: Optional[Dict[str, Any]] = None,
+                 payload_encoding: str = 'string',
+                 exchange: Optional[str] = None,
+                 redelivered: Optional[bool] = None,
+                 message_count: Optional[int] = None) -> None:
+        """
+
+        :param payload:
+        :param routing_key:
+        :param properties: i.e. {'delivery_mode': 2, 'headers': {}}
+        :param payload_encoding: 'string' or 'base64'
+        :param exchange: the exchange the message was published to (retrieved messages only)
+        :param redelivered: (retrieved messages only)
+        :param message_count: the number of messages left in the queue (retrieved messages only)
+        """
+        self.payload = payload
+        self.routing_key = routing_key
+        self.properties = properties or {}
+        self.payload_encoding = payload_encoding
+        self.exchange = exchange
+        self.redelivered = redelivered
+        self.message_count = message_count
+
+    def to_json(self):
+        return {
+            'routing_key': self.routing_key,
+            'properties': self.properties,
+            'payload': self.payload,
+            'payload_encoding': self.payload_encoding
+        }
+
+    @classmethod
+    def from_json(cls, message_dict):
+        return cls(
+            payload=message_dict['payload'],
+            routing_key=message_dict.get('routing_key', ''),
+            properties=message_dict.get('properties') or {},
+            payload_encoding=message_dict.get('payload_encoding', 'string'),
+            exchange=message_dict.get('exchange'),
+            redelivered=message_dict.get('redelivered'),
+            message_count=message_dict.get('message_count')
+        )
+
+
+class RabbitMQQueueSpec(BaseModel):
+
+    QUEUE_TYPES = ('classic', 'quorum', 'stream')
+    OVERFLOW_BEHAVIOURS = ('drop-head', 'reject-publish', 'reject-publish-dlx')
+
+    def __init__(self,
+                 queue_type: str = 'classic',
+                 durable: bool = True,
+                 auto_delete: bool = False,
+                 lazy: bool = False,
+                 max_length: Optional[int] = None,
+                 max_length_bytes: Optional[int] = None,
+                 overflow: Optional[str] = None,
+                 message_ttl: Optional[int] = None,
+                 single_active_consumer: bool = False,
+                 max_priority: Optional[int] = None,
+                 arguments: Optional[Dict[str, Any]] = None) -> None:
+        """
+        The declaration arguments of a queue
+        :param queue_type: 'classic', 'quorum' or 'stream'
+        :param durable: indicates whether the queue survives a broker restart
+        :param auto_delete: indicates whether the queue will be deleted when its last consumer unsubscribes
+        :param lazy: keeps the messages on disk (classic queues only)
+        :param max_length: the maximum number of messages
+        :param max_length_bytes: the maximum total size of the message bodies
+        :param overflow: 'drop-head', 'reject-publish' or 'reject-publish-dlx'
+        :param message_ttl: in milliseconds
+        :param single_active_consumer:
+        :param max_priority: enables priorities from 0 up to this value (1-255, classic queues only)
+        :param arguments: any extra argument, i.e. {'x-max-age': '7D'}
+        """
+        self.queue_type = queue_type
+        self.durable = durable
+        self.auto_delete = auto_delete
+        self.lazy = lazy
+        self.max_length = max_length
+        self.max_length_bytes = max_length_bytes
+        self.overflow = overflow
+        self.message_ttl = message_ttl
+        self.single_active_consumer = single_active_consumer
+        self.max_priority = max_priority
+        self.arguments = arguments or {}
+
+    def validate(self) -> None:
+        """
+        :raises: ValueError if the combination of arguments is not supported by the broker
+        """
+        if self.queue_type not in self.QUEUE_TYPES:
+            raise ValueError(f"Invalid queue type '{self.queue_type}'. Choose one of {self.QUEUE_TYPES}")
+
+        if self.overflow is not None and self.overflow not in self.OVERFLOW_BEHAVIOURS:
+            raise ValueError(f"Invalid overflow '{self.overflow}'. Choose one of {self.OVERFLOW_BEHAVIOURS}")
+
+        if self.max_priority is not None and not 1 <= self.max_priority <= 255:
+            raise ValueError('max_priority should be between 1 and 255')
+
+        if self.queue_type == 'classic':
+            return
+
+        if not self.durable or self.auto_delete:
+            raise ValueError(f'{self.queue_type} queues should be durable and cannot be auto deleted')
+
+        if self.lazy:
+            raise ValueError(f'{self.queue_type} queues cannot be lazy')
+
+        if self.max_priority is not None:
+            raise ValueError(f'{self.queue_type} queues do not support priorities')
+
+        if self.queue_type == 'quorum' and self.overflow == 'reject-publish-dlx':
+            raise ValueError("quorum queues do not support 'reject-publish-dlx' overflow")
+
+        if self.queue_type == 'stream':
+            unsupported = [name for name, value in [('max_length', self.max_length),
+                                                    ('overflow', self.overflow),
+                                                    ('message_ttl', self.message_ttl)] if value is not None]
+            if self.single_active_consumer:
+                unsupported.append('single_active_consumer')
+
+            if unsupported:
+                raise ValueError(f"stream queues do not support {', '.join(unsupported)}")
+
+    def get_arguments(self) -> Dict[str, Any]:
+        arguments = {}
+
+        if self.queue_type != 'classic':
+            arguments['x-queue-type'] = self.queue_type
+        if self.lazy:
+            arguments['x-queue-mode'] = 'lazy'
+        if self.max_length is not None:
+            arguments['x-max-length'] = self.max_length
+        if self.max_length_bytes is not None:
+            arguments['x-max-length-bytes'] = self.max_length_bytes
+        if self.overflow is not None:
+            arguments['x-overflow'] = self.overflow
+        if self.message_ttl is not None:
+            arguments['x-message-ttl'] = self.message_ttl
+        if self.single_active_consumer:
+            arguments['x-single-active-consumer'] = True
+        if self.max_priority is not None:
+            arguments['x-max-priority'] = self.max_priority
+
+        arguments.update(self.arguments)
+
+        return arguments
+
+    def with_max_length(self, max_length: Optional[int]) -> 'RabbitMQQueueSpec':
+        """
+        :param max_length: the maximum number of messages, None leaves the spec as it is
+        :return: a validated copy of the spec with the given maximum length
+        :raises: ValueError if the spec has another maximum length or does not support one (streams)
+        """
+        if max_length is None:
+            return self
+
+        if self.max_length is not None and self.max_length != max_length:
+            raise ValueError(f'max_length {max_length} conflicts with the max_length {self.max_length} of the spec')
+
+        spec = RabbitMQQueueSpec(**dict(vars(self), max_length=max_length))
+        spec.validate()
+
+        return spec
+
+    def to_json(self):
+        self.validate()
+
+        return {
+            'durable': self.durable,
+            'auto_delete': self.auto_delete,
+            'arguments': self.get_arguments()
+        }
+
+    @classmethod
+    def high_throughput_classic(cls, **kwargs) -> 'RabbitMQQueueSpec':
+        """
+        A transient classic queue that rejects publishes instead of growing without bound
+        """
+        return cls(**dict({'queue_type': 'classic', 'durable': False, 'max_length': 100000,
+                           'overflow': 'reject-publish'}, **kwargs))
+
+    @classmethod
+    def lazy_backlog(cls, **kwargs) -> 'RabbitMQQueueSpec':
+        """
+        A durable classic queue keeping its messages on disk, for long backlogs without memory pressure
+        """
+        return cls(**dict({'queue_type': 'classic', 'durable': True, 'lazy': True}, **kwargs))
+
+    @classmethod
+    def replicated_quorum(cls, **kwargs) -> 'RabbitMQQueueSpec':
+        """
+        A quorum queue replicated on 3 nodes that rejects publishes when full
+        """
+        return cls(**dict({'queue_type': 'quorum', 'durable': True, 'overflow': 'reject-publish',
+                           'arguments': {'x-quorum-initial-group-size': 3}}, **kwargs))
+
+    @classmethod
+    def stream_for_replay(cls, **kwargs) -> 'RabbitMQQueueSpec':
+        """
+        A stream retaining up to 7 days or 20GB of messages so that consumers can replay them
+        """
+        return cls(**dict({'queue_type': 'stream', 'durable': True, 'max_length_bytes': 20 * 1024 ** 3,
+                           'arguments': {'x-max-age': '7D'}}, **kwargs))
+
+    @classmethod
+    def from_profile(cls, profile: str, **kwargs) -> 'RabbitMQQueueSpec':
+        """
+        :param profile: 'high-throughput-classic', 'lazy-backlog', 'replicated-quorum' or 'stream-for-replay'
+        :param kwargs: overrides the arguments of the profile
+        :raises: ValueError if the profile does not exist
+        """
+        try:
+            factory = QUEUE_PROFILES[profile]
+        except KeyError:
+            raise ValueError(f"Invalid queue profile '{profile}'. Choose one of {tuple(QUEUE_PROFILES)}")
+
+        return factory(**kwargs)
+
+
+QUEUE_PROFILES = {
+    'high-throughput-classic': RabbitMQQueueSpec.high_throughput_classic,
+    'lazy-backlog': RabbitMQQueueSpec.lazy_backlog,
+    'replicated-quorum': RabbitMQQueueSpec.replicated_quorum,
+    'stream-for-replay': RabbitMQQueueSpec.stream_for_replay,
+}
@@ -0,0 +1,249 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import typing as t
+
+from broker_rest_client.models import RabbitMQQueueSpec
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+QUEUE_COLUMNS = ['name', 'vhost', 'type', 'node', 'leader', 'members',
+                 'message_stats.publish_details.rate', 'message_stats.deliver_get_details.rate']
+
+
+def _get_rate(queue: t.Dict) -> float:
+    stats = queue.get('message_stats') or {}
+
+    return sum((stats.get(name) or {}).get('rate', 0.0) for name in ('publish_details', 'deliver_get_details'))
+
+
+class NodeLoad:
+
+    def __init__(self, name: str, leaders: int = 0, message_rate: float = 0.0) -> None:
+        """
+        :param name: the name of the node, i.e. rabbit@host
+        :param leaders: the number of queues whose leader (or master) runs on the node
+        :param message_rate: the sum of the publish and deliver rates of these queues in messages per second
+        """
+        self.name = name
+        self.leaders = leaders
+        self.message_rate = message_rate
+
+    def __repr__(self):
+        return f"<NodeLoad {self.name} leaders={self.leaders} message_rate={self.message_rate:.1f}>"
+
+
+class PlacementMove:
+
+    def __init__(self, queue: str, vhost: str, from_node: str, to_node: str, message_rate: float) -> None:
+        self.queue = queue
+        self.vhost = vhost
+        self.from_node = from_node
+        self.to_node = to_node
+        self.message_rate = message_rate
+
+    def __eq__(self, other):
+        return isinstance(other, PlacementMove) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return f"<PlacementMove {self.vhost}/{self.queue}: {self.from_node} -> {self.to_node}>"
+
+
+class PlacementPlanner:
+
+    def __init__(self, client, leader_weight: float = 1.0) -> None:
+        """
+        Balances the queue leaders of a cluster across its nodes. The load of a node is the message rate of the
+        queues it leads plus `leader_weight` for every one of them, so that idle queues count as well.
+
+        :param client: a RabbitMQRestClient
+        :param leader_weight: the load of a queue leader regardless of its message rate
+        """
+        self.client = client
+        self.leader_weight = leader_weight
+
+    def _get_load(self, node: NodeLoad) -> float:
+        return node.message_rate + self.leader_weight * node.leaders
+
+    def _read(self) -> t.Tuple[t.Dict[str, NodeLoad], t.List[t.Dict]]:
+        nodes = {node['name']: NodeLoad(node['name'])
+                 for node in self.client.get_nodes(columns=['name', 'running'])
+                 if node.get('running', True)}
+
+        queues = self.client.get_queues(columns=QUEUE_COLUMNS, all_vhosts=True) or []
+
+        for queue in queues:
+            node = nodes.get(queue.get('leader') or queue.get('node'))
+            if node is not None:
+                node.leaders += 1
+                node.message_rate += _get_rate(queue)
+
+        return nodes, queues
+
+    def get_node_loads(self) -> t.Dict[str, NodeLoad]:
+        """
+        Reads the running nodes and all the queues of the cluster with a single listing each
+        :return: the load of every running node
+        :raises: rest_client.errors.APIError
+        """
+        nodes, _ = self._read()
+
+        return nodes
+
+    def recommend_node(self) -> str:
+        """
+        :return: the name of the least loaded running node
+        :raises: rest_client.errors.APIError
+        """
+        nodes = self.get_node_loads()
+
+        if not nodes:
+            raise ValueError('No running node was found')
+
+        return min(nodes.values(), key=lambda node: (self._get_load(node), node.name)).name
+
+    @staticmethod
+    def _get_locator_argument(spec: RabbitMQQueueSpec) -> str:
+        return 'x-queue-master-locator' if spec.queue_type == 'classic' else 'x-queue-leader-locator'
+
+    @staticmethod
+    def recommend_spec(spec: t.Optional[RabbitMQQueueSpec] = None) -> RabbitMQQueueSpec:
+        """
+        Lets the broker place the leader of a new queue on the node hosting the fewest leaders. This is an alternative
+        to create_queue: the spec should be declared without a node since the locator decides where the leader goes.
+        :param spec: the spec to extend, defaults to a durable classic queue
+        :return: a copy of the spec with the leader locator argument
+        """
+        spec = spec or RabbitMQQueueSpec()
+        arguments = dict(spec.arguments)
+
+        arguments.setdefault(PlacementPlanner._get_locator_argument(spec),
+                             'min-masters' if spec.queue_type == 'classic' else 'balanced')
+
+        return RabbitMQQueueSpec(**dict(vars(spec), arguments=arguments))
+
+    def create_queue(self, name: str, spec: t.Optional[RabbitMQQueueSpec] = None) -> str:
+        """
+        Creates a queue with its leader on the least loaded node, as weighted by the message rates. The queue is
+        declared on that node with the 'client-local' locator so that neither a policy nor the broker's default
+        locator moves the leader elsewhere.
+        :param name:
+        :param spec: should not set a leader locator
+        :return: the name of the node
+        :raises: ValueError if the spec sets a leader locator other than 'client-local'
+        :raises: rest_client.errors.APIError
+        """
+        spec = spec or RabbitMQQueueSpec()
+        argument = self._get_locator_argument(spec)
+
+        if spec.arguments.get(argument, 'client-local') != 'client-local':
+            raise ValueError(f'{argument} would override the node chosen by the planner')
+
+        spec = RabbitMQQueueSpec(**dict(vars(spec), arguments=dict(spec.arguments, **{argument: 'client-local'})))
+
+        node = self.recommend_node()
+
+        self.client.create_queue(name, spec=spec, node=node)
+
+        return node
+
+    def plan_rebalance(self, max_moves: t.Optional[int] = None) -> t.List[PlacementMove]:
+        """
+        Computes which quorum queue leaders should move so that the load is spread evenly. Leaders are only moved to
+        nodes that are already members of the queue. The busiest leaders of the most loaded node are moved first as
+        long as a move lowers the load of the most loaded node.
+        :param max_moves: the maximum number of moves
+        :return:
+        :raises: rest_client.errors.APIError
+        """
+        nodes, queues = self._read()
+        moves = []
+
+        candidates = {}
+        for queue in queues:
+            leader = queue.get('leader') or queue.get('node')
+            if queue.get('type') == 'quorum' and leader in nodes:
+                candidates.setdefault(leader, []).append(queue)
+
+        for node_queues in candidates.values():
+            node_queues.sort(key=_get_rate, reverse=True)
+
+        while max_moves is None or len(moves) < max_moves:
+            busiest = max(nodes.values(), key=self._get_load, default=None)
+            if busiest is None:
+                break
+
+            move = self._find_move(busiest, nodes, candidates.get(busiest.name, []))
+            if move is None:
+                break
+
+            queue, target = move
+            candidates[busiest.name].remove(queue)
+            candidates.setdefault(target.name, []).append(queue)
+
+            rate = _get_rate(queue)
+            busiest.leaders -= 1
+            busiest.message_rate -= rate
+            target.leaders += 1
+            target.message_rate += rate
+
+            moves.append(PlacementMove(queue['name'], queue.get('vhost'), busiest.name, target.name, rate))
+
+        return moves
+
+    def _find_move(self,
+                   busiest: NodeLoad,
+                   nodes: t.Dict[str, NodeLoad],
+                   queues: t.List[t.Dict]) -> t.Optional[t.Tuple[t.Dict, NodeLoad]]:
+        busiest_load = self._get_load(busiest)
+
+        for queue in queues:
+            cost = _get_rate(queue) + self.leader_weight
+            members = [nodes[member] for member in queue.get('members') or [] if member in nodes]
+
+            for target in sorted(members, key=self._get_load):
+                if target is not busiest and self._get_load(target) + cost < busiest_load:
+                    return queue, target
+
+        return None
+
+    def apply_rebalance(self) -> t.List[PlacementMove]:
+        """
+        Computes the rebalancing plan and asks the broker to rebalance the queue leaders. The management API cannot
+        move individual leaders so the broker's own rebalancing is triggered, which pursues the same goal.
+        :return: the computed plan
+        :raises: rest_client.errors.APIError
+        """
+        moves = self.plan_rebalance()
+
+        if moves:
+            self.client.rebalance_queues()
+
+        return moves
@@ -0,0 +1,101 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import typing as t
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def get_shard_name(name: str, index: int) -> str:
+    return f'{name}.{index}'
+
+
+def get_shard_weights(shards: int, weights: t.Optional[t.List[int]] = None) -> t.Dict[int, int]:
+    """
+    :param shards: the number of shards
+    :param weights: the weight of every shard, defaults to 1 for all of them
+    :return: the weight of every shard by index
+    :raises: ValueError
+    """
+    if shards < 1:
+        raise ValueError('shards should be a positive integer')
+
+    weights = weights or [1] * shards
+
+    if len(weights) != shards:
+        raise ValueError(f'{len(weights)} weights were given for {shards} shards')
+
+    if any(weight < 1 for weight in weights):
+        raise ValueError('weights should be positive integers')
+
+    return dict(enumerate(weights))
+
+
+class ShardedQueueResize:
+
+    def __init__(self) -> None:
+        """
+        The outcome of resizing a sharded queue
+        """
+        self.added: t.List[str] = []
+        self.reweighted: t.List[str] = []
+        self.removed: t.List[str] = []
+        self.retained: t.List[str] = []
+
+    def __repr__(self):
+        return f"<ShardedQueueResize added={self.added} reweighted={self.reweighted} removed={self.removed} " \
+               f"retained={self.retained}>"
+
+
+class ShardDistribution:
+
+    def __init__(self, depths: t.Dict[str, int]) -> None:
+        """
+        :param depths: the number of messages of every shard
+        """
+        self.depths = depths
+
+    @property
+    def total(self) -> int:
+        return sum(self.depths.values())
+
+    @property
+    def skew(self) -> float:
+        """
+        :return: the ratio of the deepest shard to the mean depth. 1.0 means a perfectly even distribution.
+        """
+        if not self.depths or not self.total:
+            return 1.0
+
+        mean = self.total / len(self.depths)
+
+        return max(self.depths.values()) / mean
+
+    def __repr__(self):
+        return f"<ShardDistribution total={self.total} skew={self.skew:.2f} depths={self.depths}>"
@@ -0,0 +1,391 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import json
+import mmap
+import struct
+import sys
+import typing as t
+from array import array
+from urllib.parse import unquote
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+_MAGIC = b'BRCSNAP2'
+# both sizes are multiples of 8 so that, with the padding of the payloads, every payload is 8 bytes aligned
+_HEADER = struct.Struct('<8scxxxxxxxIxxxx')
+_SECTION = struct.Struct('<H32scxxxxxQ')
+
+# the columns of every table as (name, array typecode). 'I' columns hold ids of the string table.
+_TABLES = {
+    'exchanges': [('name', 'I'), ('type', 'I'), ('arguments', 'I'), ('flags', 'B')],
+    'queues': [('name', 'I'), ('type', 'I'), ('arguments', 'I'), ('flags', 'B')],
+    'bindings': [('source', 'I'), ('destination', 'I'), ('destination_type', 'I'), ('routing_key', 'I'),
+                 ('arguments', 'I')],
+    'users': [('name', 'I'), ('tags', 'I')],
+    'permissions': [('user', 'I'), ('configure', 'I'), ('write', 'I'), ('read', 'I')],
+    'policies': [('name', 'I'), ('pattern', 'I'), ('apply_to', 'I'), ('priority', 'i'), ('definition', 'I')],
+}
+
+_FLAGS = ('durable', 'auto_delete', 'internal')
+
+# fields holding JSON objects are stored as (interned) canonical JSON strings
+_JSON_FIELDS = {'arguments', 'definition'}
+
+# the listing field of every column whose name differs
+_FIELDS = {'apply_to': 'apply-to'}
+
+
+def _pad(length: int) -> int:
+    return -length % 8
+
+
+def _release(views: t.List[memoryview], mapped: mmap.mmap) -> None:
+    # the views should be released, most derived first, before the map can be closed
+    for view in reversed(views):
+        view.release()
+
+    mapped.close()
+
+
+class StringTable:
+
+    def __init__(self) -> None:
+        """
+        Interns strings so that each distinct value is stored once and columns only hold integer ids
+        """
+        self._strings: t.List[str] = []
+        self._ids: t.Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        string_id = self._ids.get(value)
+
+        if string_id is None:
+            string_id = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+
+        return string_id
+
+    def lookup(self, value: str) -> t.Optional[int]:
+        return self._ids.get(value)
+
+    def __getitem__(self, string_id: int) -> str:
+        return self._strings[string_id]
+
+    def __len__(self):
+        return len(self._strings)
+
+    def encode(self) -> t.Tuple[array, bytes]:
+        """
+        :return: the offsets of the strings (n + 1 items) and their utf-8 encoded concatenation
+        """
+        encoded = [value.encode('utf-8') for value in self._strings]
+        offsets = array('Q', [0])
+
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+
+        return offsets, b''.join(encoded)
+
+
+class MappedStringTable:
+
+    def __init__(self, offsets: memoryview, data: memoryview) -> None:
+        """
+        A read only string table decoding its strings from a memory mapped file on demand
+        """
+        self._offsets = offsets
+        self._data = data
+        self._cache: t.Dict[int, str] = {}
+        self._ids: t.Optional[t.Dict[str, int]] = None
+
+    def __getitem__(self, string_id: int) -> str:
+        value = self._cache.get(string_id)
+
+        if value is None:
+            value = self._cache[string_id] = \
+                bytes(self._data[self._offsets[string_id]:self._offsets[string_id + 1]]).decode('utf-8')
+
+        return value
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def lookup(self, value: str) -> t.Optional[int]:
+        if self._ids is None:
+            self._ids = {self[string_id]: string_id for string_id in range(len(self))}
+
+        return self._ids.get(value)
+
+
+class TopologySnapshot:
+
+    def __init__(self, vhost: str = '/') -> None:
+        """
+        A memory compact, read only copy of the topology of a vhost: its exchanges, queues, bindings, users,
+        permissions and policies. Every table is stored as a set of columnar arrays and strings are interned in a
+        single table. Snapshots can be saved to a binary file and loaded back lazily through mmap.
+
+        Usage:
+            snapshot = TopologySnapshot.from_client(client)
+            snapshot.save('topology.snap')
+
+            with TopologySnapshot.load('topology.snap') as snapshot:
+                snapshot.get_bindings_by_queue('queue')
+        """
+        self.vhost = vhost
+        self.strings: t.Union[StringTable, MappedStringTable] = StringTable()
+        self.columns: t.Dict[str, t.Dict[str, t.Union[array, memoryview]]] = {
+            table: {column: array(typecode) for column, typecode in columns}
+            for table, columns in _TABLES.items()
+        }
+
+        self._indexes: t.Dict[t.Tuple[str, str], t.Dict[int, t.List[int]]] = {}
+        self._mmap: t.Optional[mmap.mmap] = None
+        self._views: t.List[memoryview] = []
+
+    @classmethod
+    def from_client(cls, client) -> 'TopologySnapshot':
+        """
+        Downloads the topology of the client's vhost with one listing per table
+        :param client: a RabbitMQRestClient
+        :raises: rest_client.errors.APIError
+        """
+        snapshot = cls(unquote(client.vhost))
+
+        snapshot.extend('exchanges', client.get_exchanges(columns=['name', 'type', 'arguments'] + list(_FLAGS)))
+        snapshot.extend('queues', client.get_queues(columns=['name', 'type', 'arguments', 'durable', 'auto_delete']))
+        snapshot.extend('bindings', client.get_bindings(
+            columns=['source', 'destination', 'destination_type', 'routing_key', 'arguments']))
+        snapshot.extend('users', client.get_users())
+        snapshot.extend('permissions', client.get_permissions())
+        snapshot.extend('policies', client.get_policies())
+
+        return snapshot
+
+    def _intern_field(self, column: str, item: t.Dict[str, t.Any]) -> int:
+        value = item.get(_FIELDS.get(column, column))
+
+        if column in _JSON_FIELDS:
+            value = json.dumps(value, sort_keys=True, separators=(',', ':')) if value else '{}'
+        elif isinstance(value, list):
+            value = ','.join(value)
+
+        return self.strings.intern('' if value is None else str(value))
+
+    def extend(self, table: str, items: t.Iterable[t.Dict[str, t.Any]]) -> None:
+        """
+        Appends items, as returned by the management API listings, to a table
+        :param table: 'exchanges', 'queues', 'bindings', 'users', 'permissions' or 'policies'
+        :param items:
+        """
+        if not isinstance(self.strings, StringTable):
+            raise ValueError('A loaded snapshot is read only')
+
+        columns = self.columns[table]
+
+        for item in items:
+            for column, typecode in _TABLES[table]:
+                if column == 'flags':
+                    value = sum(1 << bit for bit, flag in enumerate(_FLAGS) if item.get(flag))
+                elif typecode == 'I':
+                    value = self._intern_field(column, item)
+                else:
+                    value = item.get(column) or 0
+
+                columns[column].append(value)
+
+        self._indexes.clear()
+
+    def __len__(self):
+        return sum(self.count(table) for table in _TABLES)
+
+    def count(self, table: str) -> int:
+        return len(self.columns[table][_TABLES[table][0][0]])
+
+    def get_row(self, table: str, row: int) -> t.Dict[str, t.Any]:
+        """
+        :return: the item of the table at the given row as a dict
+        """
+        item = {}
+
+        for column, typecode in _TABLES[table]:
+            value = self.columns[table][column][row]
+
+            if column == 'flags':
+                item.update({flag: bool(value & 1 << bit) for bit, flag in enumerate(_FLAGS)})
+            elif typecode == 'I':
+                value = self.strings[value]
+                item[_FIELDS.get(column, column)] = json.loads(value) if column in _JSON_FIELDS else value
+            else:
+                item[column] = value
+
+        if table == 'queues':
+            del item['internal']
+
+        return item
+
+    def iter_rows(self, table: str) -> t.Iterator[t.Dict[str, t.Any]]:
+        for row in range(self.count(table)):
+            yield self.get_row(table, row)
+
+    def _get_index(self, table: str, column: str) -> t.Dict[int, t.List[int]]:
+        index = self._indexes.get((table, column))
+
+        if index is None:
+            index = self._indexes[(table, column)] = {}
+
+            for row, string_id in enumerate(self.columns[table][column]):
+                index.setdefault(string_id, []).append(row)
+
+        return index
+
+    def _find(self, table: str, column: str, value: str) -> t.List[t.Dict[str, t.Any]]:
+        string_id = self.strings.lookup(value)
+
+        if string_id is None:
+            return []
+
+        return [self.get_row(table, row) for row in self._get_index(table, column).get(string_id, [])]
+
+    def get_exchange(self, name: str) -> t.Optional[t.Dict[str, t.Any]]:
+        return next(iter(self._find('exchanges', 'name', name)), None)
+
+    def get_queue(self, name: str) -> t.Optional[t.Dict[str, t.Any]]:
+        return next(iter(self._find('queues', 'name', name)), None)
+
+    def get_bindings_by_exchange(self, name: str) -> t.List[t.Dict[str, t.Any]]:
+        """
+        :return: the bindings whose source is the given exchange
+        """
+        return self._find('bindings', 'source', name)
+
+    def get_bindings_by_queue(self, name: str) -> t.List[t.Dict[str, t.Any]]:
+        """
+        :return: the bindings whose destination is the given queue
+        """
+        return [binding for binding in self._find('bindings', 'destination', name)
+                if binding['destination_type'] == 'queue']
+
+    def get_user_permissions(self, user: str) -> t.Optional[t.Dict[str, t.Any]]:
+        return next(iter(self._find('permissions', 'user', user)), None)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the snapshot into a binary file
+        :param path:
+        """
+        if isinstance(self.strings, StringTable):
+            offsets, data = self.strings.encode()
+            offsets, data = offsets.tobytes(), data
+        else:
+            offsets, data = self.strings._offsets.tobytes(), self.strings._data.tobytes()
+
+        sections = [('meta.vhost', 'B', self.vhost.encode('utf-8')),
+                    ('strings.offsets', 'Q', offsets),
+                    ('strings.data', 'B', data)]
+
+        for table, columns in _TABLES.items():
+            for column, typecode in columns:
+                sections.append((f'{table}.{column}', typecode, self.columns[table][column].tobytes()))
+
+        byteorder = b'<' if sys.byteorder == 'little' else b'>'
+
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, byteorder, len(sections)))
+
+            for name, typecode, payload in sections:
+                f.write(_SECTION.pack(len(name), name.encode('ascii'), typecode.encode('ascii'), len(payload)))
+                f.write(payload)
+                f.write(b'\0' * _pad(len(payload)))
+
+    @classmethod
+    def load(cls, path: str) -> 'TopologySnapshot':
+        """
+        Maps a file written by `save` into memory. Columns are read from the file without being copied and strings
+        are decoded on first access. The file stays open until `close` is called or the `with` block exits.
+        :param path:
+        :raises: ValueError if the file is not a snapshot
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buffer = memoryview(mapped)
+        views = [buffer]
+
+        try:
+            magic, byteorder, count = _HEADER.unpack_from(buffer, 0)
+            if magic != _MAGIC:
+                raise ValueError(f'{path} is not a topology snapshot')
+            if byteorder != (b'<' if sys.byteorder == 'little' else b'>'):
+                raise ValueError(f'{path} was written on a machine with a different byte order')
+
+            sections = {}
+            position = _HEADER.size
+            for _ in range(count):
+                name_length, name, typecode, size = _SECTION.unpack_from(buffer, position)
+                position += _SECTION.size
+
+                payload = buffer[position:position + size]
+                column = payload.cast(typecode.decode())
+                views.extend([payload, column])
+
+                sections[name[:name_length].decode('ascii')] = column
+                position += size + _pad(size)
+        except (ValueError, struct.error):
+            _release(views, mapped)
+            raise
+
+        snapshot = cls(bytes(sections['meta.vhost']).decode('utf-8'))
+        snapshot.strings = MappedStringTable(sections['strings.offsets'], sections['strings.data'])
+        snapshot.columns = {
+            table: {column: sections[f'{table}.{column}'] for column, _ in columns}
+            for table, columns in _TABLES.items()
+        }
+        snapshot._mmap = mapped
+        snapshot._views = views
+
+        return snapshot
+
+    def close(self) -> None:
+        """
+        Unmaps the file of a loaded snapshot, which cannot be read afterwards
+        """
+        if self._mmap is not None:
+            _release(self._views, self._mmap)
+            self._mmap, self._views = None, []
+
+    def __enter__(self) -> 'TopologySnapshot':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+
+        return False
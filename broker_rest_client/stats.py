@@ -0,0 +1,86 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import time
+import typing as t
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+class ThroughputStats:
+
+    def __init__(self) -> None:
+        """
+        Keeps track of the number of items processed by a bulk operation and the rate at which they were processed
+        """
+        self.count = 0
+        self.errors: t.List[t.Tuple[t.Any, Exception]] = []
+        # the items that were not processed because the deadline had passed
+        self.cancelled: t.List[t.Any] = []
+        self.started_at = time.monotonic()
+        self.finished_at: t.Optional[float] = None
+
+    def add(self, count: int = 1) -> None:
+        self.count += count
+
+    def add_error(self, item: t.Any, error: Exception) -> None:
+        self.errors.append((item, error))
+
+    def add_cancelled(self, item: t.Any) -> None:
+        self.cancelled.append(item)
+
+    def finish(self) -> None:
+        self.finished_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """
+        :return: the duration of the operation in seconds
+        """
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """
+        :return: the number of processed items per second
+        """
+        elapsed = self.elapsed
+
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return f"<{type(self).__name__} count={self.count} errors={len(self.errors)} " \
+               f"cancelled={len(self.cancelled)} elapsed={self.elapsed:.3f}s rate={self.rate:.1f}/s>"
+
+
+class PublishStats(ThroughputStats):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.unroutable: t.List[t.Any] = []
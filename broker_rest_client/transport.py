@@ -0,0 +1,174 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import gzip
+import json
+import typing as t
+from collections.abc import MutableMapping
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+class JSONSerializer:
+    """
+    Encodes request bodies and decodes response bodies. The default implementation uses the stdlib json module.
+    """
+    name = 'json'
+
+    def dumps(self, obj: t.Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data: t.Union[bytes, str]) -> t.Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(JSONSerializer):
+    name = 'orjson'
+
+    def dumps(self, obj: t.Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: t.Union[bytes, str]) -> t.Any:
+        return orjson.loads(data)
+
+
+class UjsonSerializer(JSONSerializer):
+    name = 'ujson'
+
+    def dumps(self, obj: t.Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data: t.Union[bytes, str]) -> t.Any:
+        return ujson.loads(data)
+
+
+def get_fastest_serializer() -> JSONSerializer:
+    """
+    :return: the fastest available serializer: orjson, then ujson and finally the stdlib json module
+    """
+    if orjson is not None:
+        return OrjsonSerializer()
+    if ujson is not None:
+        return UjsonSerializer()
+
+    return JSONSerializer()
+
+
+class TransportResponse:
+
+    def __init__(self, response, serializer: JSONSerializer) -> None:
+        """
+        Wraps a response of the underlying request handler so that its body is decoded with the given serializer.
+        :param response:
+        :param serializer:
+        """
+        self._response = response
+        self._serializer = serializer
+
+    def json(self, **kwargs) -> t.Any:
+        return self._serializer.loads(self._response.content)
+
+    def __getattr__(self, item):
+        return getattr(self._response, item)
+
+
+class TransportRequestHandler:
+
+    def __init__(self,
+                 request_handler,
+                 serializer: t.Optional[JSONSerializer] = None,
+                 compress_threshold: t.Optional[int] = None,
+                 compress_level: int = 6) -> None:
+        """
+        Wraps a request handler (i.e. a requests.Session) in order to:
+        - negotiate gzip compressed responses
+        - encode JSON request bodies and decode JSON responses with a pluggable serializer
+        - optionally gzip request bodies that are larger than `compress_threshold` bytes. Note that the server (or a
+          proxy in front of it) should accept 'Content-Encoding: gzip' request bodies.
+
+        :param request_handler:
+        :param serializer: defaults to the stdlib json module
+        :param compress_threshold: the size in bytes above which request bodies are compressed. None disables it.
+        :param compress_level: the gzip compression level (1-9)
+        """
+        self._request_handler = request_handler
+        self.serializer = serializer or JSONSerializer()
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+        headers = getattr(request_handler, 'headers', None)
+        if isinstance(headers, MutableMapping):
+            headers.setdefault('Accept-Encoding', 'gzip, deflate')
+
+    def _encode_body(self, obj: t.Any, headers: t.Dict[str, str]) -> bytes:
+        body = self.serializer.dumps(obj)
+        headers['Content-Type'] = 'application/json'
+
+        if self.compress_threshold is not None and len(body) > self.compress_threshold:
+            body = gzip.compress(body, compresslevel=self.compress_level)
+            headers['Content-Encoding'] = 'gzip'
+
+        return body
+
+    def request(self, method: str, url: str, **kwargs) -> TransportResponse:
+        json_data = kwargs.pop('json', None)
+
+        if json_data is not None:
+            headers = dict(kwargs.pop('headers', None) or {})
+            kwargs['data'] = self._encode_body(json_data, headers)
+            kwargs['headers'] = headers
+
+        response = getattr(self._request_handler, method.lower())(url, **kwargs)
+
+        return TransportResponse(response, self.serializer)
+
+    def get(self, url: str, **kwargs) -> TransportResponse:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> TransportResponse:
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> TransportResponse:
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> TransportResponse:
+        return self.request('DELETE', url, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self._request_handler, item)
@@ -0,0 +1,215 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import hashlib
+import json
+import logging
+import threading
+import typing as t
+
+__author__ = "EUROCONTROL (SWIM)"
+
+_logger = logging.getLogger(__name__)
+
+
+QUEUE = 'queue'
+EXCHANGE = 'exchange'
+BINDING = 'binding'
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+
+DEFAULT_COLUMNS = {
+    QUEUE: ['name', 'durable', 'auto_delete', 'exclusive', 'arguments', 'policy'],
+    EXCHANGE: ['name', 'type', 'durable', 'auto_delete', 'internal', 'arguments', 'policy'],
+    BINDING: ['source', 'destination', 'destination_type', 'routing_key', 'arguments', 'properties_key'],
+}
+
+
+def _get_key(object_type: str, obj: t.Dict) -> t.Union[str, t.Tuple]:
+    if object_type == BINDING:
+        return obj['source'], obj['destination_type'], obj['destination'], obj['properties_key']
+
+    return obj['name']
+
+
+def _get_digest(obj: t.Dict) -> bytes:
+    return hashlib.blake2b(json.dumps(obj, sort_keys=True).encode('utf-8'), digest_size=8).digest()
+
+
+class TopologyEvent:
+
+    def __init__(self,
+                 kind: str,
+                 object_type: str,
+                 key: t.Union[str, t.Tuple],
+                 data: t.Optional[t.Dict] = None) -> None:
+        """
+        :param kind: 'added', 'removed' or 'changed'
+        :param object_type: 'queue', 'exchange' or 'binding'
+        :param key: the name of a queue or exchange or (source, destination_type, destination, properties_key) for
+                    a binding
+        :param data: the watched columns of the object. None for removed objects.
+        """
+        self.kind = kind
+        self.object_type = object_type
+        self.key = key
+        self.data = data
+
+    def __eq__(self, other):
+        return isinstance(other, TopologyEvent) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return f"<TopologyEvent {self.kind} {self.object_type} {self.key!r}>"
+
+
+class TopologyWatcher:
+
+    def __init__(self,
+                 client,
+                 interval: float = 10.0,
+                 object_types: t.Iterable[str] = (QUEUE, EXCHANGE, BINDING),
+                 columns: t.Optional[t.Dict[str, t.List[str]]] = None) -> None:
+        """
+        Polls the queues, exchanges and bindings of the client's vhost and emits only what changed between two polls.
+        Every poll is a single listing request per object type restricted to the watched columns, and only a short
+        digest of each object is kept between polls.
+
+        Usage:
+            watcher = TopologyWatcher(client, interval=5)
+            watcher.subscribe(lambda events: print(events))
+            watcher.start()
+            ...
+            watcher.stop()
+
+        :param client: a RabbitMQRestClient
+        :param interval: the polling interval in seconds
+        :param object_types: any of 'queue', 'exchange' and 'binding'
+        :param columns: overrides the watched columns per object type. Changes in other fields are not detected.
+        """
+        self.client = client
+        self.interval = interval
+        self.object_types = list(object_types)
+        self.columns = dict(DEFAULT_COLUMNS, **(columns or {}))
+
+        self._digests: t.Dict[str, t.Dict[t.Any, bytes]] = {}
+        self._callbacks: t.List[t.Callable[[t.List[TopologyEvent]], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: t.Optional[threading.Thread] = None
+
+    def _list(self, object_type: str) -> t.List[t.Dict]:
+        getter = {
+            QUEUE: self.client.get_queues,
+            EXCHANGE: self.client.get_exchanges,
+            BINDING: self.client.get_bindings,
+        }[object_type]
+
+        return getter(columns=self.columns[object_type]) or []
+
+    def poll(self) -> t.List[TopologyEvent]:
+        """
+        Lists the watched objects once. On the first poll every object is reported as added.
+        :return: the events since the previous poll
+        :raises: rest_client.errors.APIError
+        """
+        events = []
+
+        for object_type in self.object_types:
+            previous = self._digests.get(object_type, {})
+            current = {}
+
+            for obj in self._list(object_type):
+                key = _get_key(object_type, obj)
+                digest = _get_digest(obj)
+                current[key] = digest
+
+                if key not in previous:
+                    events.append(TopologyEvent(ADDED, object_type, key, obj))
+                elif previous[key] != digest:
+                    events.append(TopologyEvent(CHANGED, object_type, key, obj))
+
+            events.extend(TopologyEvent(REMOVED, object_type, key) for key in previous if key not in current)
+
+            self._digests[object_type] = current
+
+        return events
+
+    def subscribe(self, callback: t.Callable[[t.List[TopologyEvent]], None]) -> None:
+        """
+        :param callback: called from the polling thread with the events of every poll that detected changes
+        """
+        self._callbacks.append(callback)
+
+    def _notify(self, events: t.List[TopologyEvent]) -> None:
+        # a failing subscriber should neither stop the polling thread nor deprive the others of the events
+        for callback in list(self._callbacks):
+            try:
+                callback(events)
+            except Exception:
+                _logger.exception('Subscriber %r failed to handle the topology events', callback)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                events = self.poll()
+            except Exception:
+                _logger.exception('Failed to poll the broker topology')
+            else:
+                if events:
+                    self._notify(events)
+
+            self._stop_event.wait(self.interval)
+
+    def start(self) -> None:
+        """
+        Starts polling in a daemon thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='TopologyWatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: t.Optional[float] = None) -> None:
+        self._stop_event.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> 'TopologyWatcher':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
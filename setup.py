@@ -41,6 +41,12 @@ setup(
     packages=find_packages(exclude=['tests']),
     url='https://github.com/eurocontrol-swim/broker-rest-client',
     install_requires=[],
+    extras_require={
+        'yaml': ['pyyaml']
+    },
+    entry_points={
+        'console_scripts': ['broker-rest-client=broker_rest_client.cli:main']
+    },
     tests_require=[
         'pytest',
         'pytest-cov'
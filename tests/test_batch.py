@@ -0,0 +1,171 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+from unittest.mock import Mock
+
+import pytest
+from rest_client.errors import APIError
+
+from broker_rest_client.models import RabbitMQUserPermissions, RabbitMQQueueSpec
+from broker_rest_client.rabbitmq_rest_client import RabbitMQRestClient
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+@pytest.fixture()
+def client():
+    client = RabbitMQRestClient(request_handler=Mock())
+    client.perform_request = Mock()
+
+    return client
+
+
+def test_batch__operations_are_not_run_before_exiting_the_block(client):
+    with client.batch() as batch:
+        batch.create_queue('queue')
+
+        client.perform_request.assert_not_called()
+
+    client.perform_request.assert_called_once()
+
+
+def test_batch__exception_in_block__operations_are_not_run(client):
+    with pytest.raises(ValueError):
+        with client.batch() as batch:
+            batch.create_queue('queue')
+            raise ValueError()
+
+    client.perform_request.assert_not_called()
+
+
+def test_batch__duplicate_operations_are_dropped(client):
+    with client.batch() as batch:
+        batch.create_queue('queue')
+        batch.create_queue('queue')
+        batch.bind_queue_to_topic('queue', 'key')
+        batch.bind_queue_to_topic('queue', 'key', topic='amq.topic')
+
+    assert 2 == client.perform_request.call_count
+
+
+def test_batch__dependencies_run_before_dependants(client):
+    called_urls = []
+    lock = threading.Lock()
+
+    def perform_request(method, url, json=None):
+        with lock:
+            called_urls.append(url)
+
+    client.perform_request = perform_request
+
+    with client.batch() as batch:
+        batch.bind_queue_to_topic('queue', 'key', topic='topic')
+        batch.set_user_permissions('user', RabbitMQUserPermissions(configure=".*", write=".*", read=".*"))
+        batch.create_queue('queue')
+        batch.create_user('user', 'password')
+        batch.create_topic('topic')
+
+    assert [['create_queue', 'create_user', 'create_topic'], ['bind_queue_to_topic', 'set_user_permissions']] == \
+        [[operation.method for operation in level] for level in batch.get_levels()]
+
+    assert set(called_urls[:3]) == {'api/queues/%2F/queue', 'api/users/user', 'api/exchanges/%2F/topic'}
+    assert set(called_urls[3:]) == {'api/bindings/%2F/e/topic/q/queue', 'api/permissions/%2F/user'}
+
+
+def test_batch__dependants_of_failed_operations_are_skipped(client):
+    def perform_request(method, url, json=None):
+        if url == 'api/queues/%2F/queue':
+            raise APIError('error', 500)
+
+    client.perform_request = perform_request
+
+    with client.batch() as batch:
+        batch.create_queue('queue')
+        batch.create_queue('other_queue')
+        batch.bind_queue_to_topic('queue', 'key')
+        batch.bind_queue_to_topic('other_queue', 'key')
+
+    results = {repr(result.operation): result for result in batch.results}
+
+    assert 2 == len(batch.failed)
+    assert isinstance(results["create_queue(name='queue', max_length=None, durable=False, auto_delete=False)"].error,
+                      APIError)
+    assert results["bind_queue_to_topic(queue='queue', key='key', topic='amq.topic', durable=False)"].skipped
+    assert results["bind_queue_to_topic(queue='other_queue', key='key', topic='amq.topic', durable=False)"].succeeded
+
+
+def test_batch__progress_is_called_with_every_result(client):
+    results = []
+
+    with client.batch(progress=results.append) as batch:
+        batch.create_queue('queue')
+        batch.create_topic('topic')
+        batch.bind_queue_to_topic('queue', 'key', topic='topic')
+
+    assert batch.results == results
+    assert 'bind_queue_to_topic' == results[-1].operation.method
+
+
+def test_batch__timeout__operations_not_started_in_time_are_cancelled(client):
+    with client.batch(timeout=0) as batch:
+        batch.create_queue('queue')
+        batch.create_topic('topic')
+        batch.bind_queue_to_topic('queue', 'key', topic='topic')
+
+    results = {result.operation.method: result for result in batch.results}
+
+    client.perform_request.assert_not_called()
+    assert 2 == len(batch.cancelled)
+    assert results['create_queue'].cancelled
+    assert results['bind_queue_to_topic'].skipped
+    assert 3 == len(batch.failed)
+
+
+def test_batch__invalid_queue_spec__raises_value_error_when_recorded(client):
+    with pytest.raises(ValueError):
+        with client.batch() as batch:
+            batch.create_queue('queue', spec=RabbitMQQueueSpec(queue_type='stream', max_priority=10))
+
+    client.perform_request.assert_not_called()
+
+
+def test_batch__max_length_with_a_stream_spec__raises_value_error_when_recorded(client):
+    with pytest.raises(ValueError):
+        with client.batch() as batch:
+            batch.create_queue('queue', max_length=5, spec=RabbitMQQueueSpec.stream_for_replay())
+
+    client.perform_request.assert_not_called()
+
+
+def test_batch__max_length_is_merged_into_the_spec(client):
+    with client.batch() as batch:
+        batch.create_queue('queue', max_length=5, spec=RabbitMQQueueSpec.replicated_quorum())
+
+    assert 5 == client.perform_request.call_args[1]['json']['arguments']['x-max-length']
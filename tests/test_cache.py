@@ -0,0 +1,219 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import multiprocessing
+import os
+import stat
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from broker_rest_client.cache import SharedCache, get_default_path
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return SharedCache(path=str(tmp_path / 'cache.sqlite3'), ttl=30)
+
+
+def test_get__missing_key__returns_none(cache):
+    assert cache.get('key') is None
+
+
+def test_set_and_get(cache):
+    cache.set('key', {'name': 'queue', 'messages': 1})
+
+    assert {'name': 'queue', 'messages': 1} == cache.get('key')
+
+
+def test_get__expired_key__returns_none(cache):
+    cache.set('key', 'value', ttl=-1)
+
+    assert cache.get('key') is None
+
+
+def test_entries_are_shared_between_instances_on_the_same_file(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+
+    SharedCache(path=path).set('key', 'value')
+
+    assert 'value' == SharedCache(path=path).get('key')
+
+
+def test_namespaces_do_not_overlap(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+
+    SharedCache(path=path, namespace='broker1:').set('key', 'value')
+
+    assert SharedCache(path=path, namespace='broker2:').get('key') is None
+
+
+def test_invalidate(cache):
+    cache.set('key1', 'value')
+    cache.set('key2', 'value')
+
+    cache.invalidate('key1')
+
+    assert cache.get('key1') is None
+    assert 'value' == cache.get('key2')
+
+
+def test_invalidate_prefix(cache):
+    cache.set('queue\x1f/\x1fqueue1', 'value')
+    cache.set('queue\x1f/\x1fqueue2', 'value')
+    cache.set('bindings\x1f/\x1fqueue1', 'value')
+
+    cache.invalidate_prefix('queue\x1f/\x1f')
+
+    assert cache.get('queue\x1f/\x1fqueue1') is None
+    assert cache.get('queue\x1f/\x1fqueue2') is None
+    assert 'value' == cache.get('bindings\x1f/\x1fqueue1')
+
+
+def test_get_or_set__value_is_fetched_once(cache):
+    fetch = Mock(return_value='value')
+
+    assert 'value' == cache.get_or_set('key', fetch)
+    assert 'value' == cache.get_or_set('key', fetch)
+
+    fetch.assert_called_once_with()
+
+
+def test_get_or_set__fetch_errors_are_not_cached(cache):
+    fetch = Mock(side_effect=[ValueError(), 'value'])
+
+    with pytest.raises(ValueError):
+        cache.get_or_set('key', fetch)
+
+    assert 'value' == cache.get_or_set('key', fetch)
+
+
+def test_get_or_set__concurrent_misses_are_coalesced(cache):
+    fetched = []
+    started = threading.Event()
+
+    def fetch():
+        started.set()
+        threading.Event().wait(0.1)
+        fetched.append(1)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_set('key', fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert ['value'] * 5 == results
+    assert [1] == fetched
+
+
+def test_get_or_set__value_fetched_before_an_invalidation_is_not_cached(cache):
+    def fetch():
+        # another process writes and invalidates while the stale value is being read
+        cache.invalidate('key')
+        return 'stale'
+
+    assert 'stale' == cache.get_or_set('key', fetch)
+    assert cache.get('key') is None
+
+    assert 'fresh' == cache.get_or_set('key', lambda: 'fresh')
+    assert 'fresh' == cache.get('key')
+
+
+def test_get_or_set__value_fetched_before_a_prefix_invalidation_is_not_cached(cache):
+    def fetch():
+        cache.clear()
+        return 'stale'
+
+    cache.get_or_set('queue\x1f/\x1fqueue', fetch)
+
+    assert cache.get('queue\x1f/\x1fqueue') is None
+
+
+def test_set__value_fetched_before_the_invalidation_horizon_is_not_stored(cache):
+    assert not cache.set('key', 'value', fetched_at=time.time() - cache.lease_timeout - cache.ttl - 1)
+    assert cache.get('key') is None
+
+    assert cache.set('key', 'value', fetched_at=time.time())
+    assert 'value' == cache.get('key')
+
+
+def test_invalidate__invalidations_older_than_the_horizon_are_pruned(tmp_path):
+    cache = SharedCache(path=str(tmp_path / 'cache.sqlite3'), ttl=0.05, lease_timeout=0.05)
+
+    cache.invalidate('key1', 'key2')
+    time.sleep(0.15)
+    cache.invalidate('key3')
+
+    keys = [row[0] for row in cache._connection.execute('SELECT key FROM invalidations')]
+    assert ['key3'] == keys
+
+
+def test_set__expired_entries_are_purged(tmp_path):
+    cache = SharedCache(path=str(tmp_path / 'cache.sqlite3'), ttl=0.05)
+
+    cache.set('key1', 'value', ttl=-1)
+    cache.set('key2', 'value')
+    time.sleep(0.06)
+    cache.set('key3', 'value')
+
+    keys = sorted(row[0] for row in cache._connection.execute('SELECT key FROM entries'))
+    assert ['key3'] == keys
+
+
+def test_default_path__is_private_to_the_user(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    os.makedirs(str(tmp_path / 'broker-rest-client'), mode=0o777)
+    os.chmod(str(tmp_path / 'broker-rest-client'), 0o777)
+
+    path = get_default_path()
+
+    assert str(tmp_path / 'broker-rest-client' / 'cache.sqlite3') == path
+    assert 0o700 == stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode)
+
+
+def _set_in_child_process(path):
+    SharedCache(path=path).set('key', 'from child')
+
+
+def test_entries_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = SharedCache(path=path)
+
+    process = multiprocessing.Process(target=_set_in_child_process, args=(path,))
+    process.start()
+    process.join()
+
+    assert 'from child' == cache.get('key')
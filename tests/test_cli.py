@@ -0,0 +1,171 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import json
+from unittest.mock import Mock
+
+import pytest
+from rest_client.errors import APIError
+
+from broker_rest_client import cli
+from broker_rest_client.models import RabbitMQQueueSpec
+from broker_rest_client.rabbitmq_rest_client import RabbitMQRestClient
+from broker_rest_client.snapshot import TopologySnapshot
+from broker_rest_client.stats import PublishStats
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+TOPOLOGY = {
+    'exchanges': [{'name': 'orders', 'type': 'topic', 'durable': True}],
+    'queues': [{'name': 'orders.eu', 'max_length': 10}, {'name': 'orders.us', 'profile': 'replicated-quorum'}],
+    'bindings': [{'queue': 'orders.eu', 'exchange': 'orders', 'routing_key': 'eu.#'}],
+    'users': [{'name': 'app', 'password': 'secret', 'permissions': {'configure': '', 'write': '.*', 'read': '.*'}}],
+    'policies': [{'name': 'ttl', 'pattern': '^orders', 'definition': {'message-ttl': 60000}}],
+}
+
+
+@pytest.fixture()
+def client():
+    client = RabbitMQRestClient(request_handler=Mock())
+    client.perform_request = Mock()
+
+    return client
+
+
+@pytest.fixture()
+def snapshot():
+    snapshot = TopologySnapshot('/')
+    snapshot.extend('exchanges', [
+        {'name': '', 'type': 'direct', 'durable': True},
+        {'name': 'amq.topic', 'type': 'topic', 'durable': True},
+        {'name': 'orders', 'type': 'topic', 'durable': True},
+    ])
+    snapshot.extend('queues', [
+        {'name': 'orders.eu', 'type': 'classic', 'durable': False, 'arguments': {'x-max-length': 10}},
+        {'name': 'legacy', 'type': 'quorum', 'durable': True, 'arguments': {'x-queue-type': 'quorum'}},
+    ])
+    snapshot.extend('bindings', [
+        {'source': '', 'destination': 'orders.eu', 'destination_type': 'queue', 'routing_key': 'orders.eu'},
+        {'source': 'orders', 'destination': 'orders.eu', 'destination_type': 'queue', 'routing_key': 'eu.#'},
+    ])
+
+    return snapshot
+
+
+@pytest.mark.parametrize('suffix', ['.json', '.yaml'])
+def test_load_topology(tmp_path, suffix):
+    path = str(tmp_path / f'topology{suffix}')
+    cli.dump_topology(TOPOLOGY, path)
+
+    assert TOPOLOGY == cli.load_topology(path)
+
+
+def test_apply_topology(client):
+    summary = cli.apply_topology(client, TOPOLOGY, concurrency=1)
+
+    assert 7 == summary['total'] == summary['count']
+    assert [] == summary['errors']
+    client.perform_request.assert_any_call('PUT', 'api/queues/%2F/orders.us',
+                                           json=RabbitMQQueueSpec.replicated_quorum().to_json())
+    client.perform_request.assert_any_call('PUT', 'api/policies/%2F/ttl', json={
+        'pattern': '^orders', 'priority': 0, 'apply-to': 'all', 'definition': {'message-ttl': 60000}})
+
+
+def test_apply_topology__failures_and_skipped_operations_are_reported(client):
+    def perform_request(method, url, json=None):
+        if url == 'api/queues/%2F/orders.eu':
+            raise APIError('error', 500)
+
+    client.perform_request = perform_request
+
+    summary = cli.apply_topology(client, TOPOLOGY, concurrency=1)
+
+    assert 5 == summary['count']
+    assert 2 == len(summary['errors'])
+
+
+def test_export_topology__leaves_out_default_exchanges_and_bindings(snapshot):
+    topology = cli.export_topology(snapshot)
+
+    assert ['orders'] == [exchange['name'] for exchange in topology['exchanges']]
+    assert [{'queue': 'orders.eu', 'exchange': 'orders', 'routing_key': 'eu.#'}] == topology['bindings']
+    assert {'queue_type': 'quorum', 'durable': True, 'auto_delete': False, 'arguments': {}} == \
+        topology['queues'][1]['spec']
+
+
+def test_diff_topology(snapshot):
+    diff = cli.diff_topology(TOPOLOGY, snapshot)
+
+    assert {'exchanges': [], 'queues': ['orders.us'], 'bindings': [], 'policies': ['ttl']} == diff['missing']
+    assert {'exchanges': [], 'queues': ['legacy'], 'bindings': [], 'policies': []} == diff['extra']
+
+
+def test_purge_queues(client):
+    summary = cli.purge_queues(client, ['a', 'b'], concurrency=2)
+
+    assert 2 == summary['count']
+    client.perform_request.assert_any_call('DELETE', 'api/queues/%2F/a/contents')
+    client.perform_request.assert_any_call('DELETE', 'api/queues/%2F/b/contents')
+
+
+def test_main__prints_summary_and_exits_with_failure_status(monkeypatch, capsys, client):
+    client.perform_request.side_effect = APIError('error', 500)
+    monkeypatch.setattr(cli, 'create_client', lambda args: client)
+
+    assert 1 == cli.main(['--quiet', 'purge', 'a'])
+
+    summary = json.loads(capsys.readouterr().out)
+    assert 'purge' == summary['command']
+    assert ['a'] == [error['item'] for error in summary['errors']]
+
+
+def test_main__bench(monkeypatch, capsys, client):
+    stats = PublishStats()
+    stats.add(5)
+    client.publish_many = Mock(return_value=stats)
+    monkeypatch.setattr(cli, 'create_client', lambda args: client)
+
+    assert 0 == cli.main(['bench', '--count', '5', '--size', '3'])
+
+    exchange, messages = client.publish_many.call_args[0]
+    assert 'amq.topic' == exchange
+    assert 5 == len([message for message in messages if message.payload == 'xxx'])
+    assert 5 == json.loads(capsys.readouterr().out)['count']
+
+
+def test_main__deadline__work_not_started_in_time_is_reported_as_cancelled(monkeypatch, capsys, client):
+    monkeypatch.setattr(cli, 'create_client', lambda args: client)
+
+    assert 1 == cli.main(['--quiet', '--deadline', '0', 'purge', 'a', 'b'])
+
+    summary = json.loads(capsys.readouterr().out)
+    assert 0 == summary['count']
+    assert 2 == summary['cancelled']
+    client.perform_request.assert_not_called()
@@ -0,0 +1,100 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+import time
+
+import pytest
+
+from broker_rest_client.concurrency import execute_concurrently, RateLimiter
+from broker_rest_client.deadline import Deadline, OperationCancelled
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def test_execute_concurrently__results_and_errors_are_yielded_per_item():
+    def func(item):
+        if item == 3:
+            raise ValueError(item)
+        return item * 2
+
+    outcomes = {item: (result, error) for item, result, error in execute_concurrently(func, range(5), max_workers=2)}
+
+    assert {0: 0, 1: 2, 2: 4, 4: 8} == {item: result for item, (result, error) in outcomes.items() if error is None}
+    assert isinstance(outcomes[3][1], ValueError)
+
+
+def test_execute_concurrently__in_flight_calls_are_bounded():
+    lock = threading.Lock()
+    in_flight = []
+    max_in_flight = []
+
+    def func(item):
+        with lock:
+            in_flight.append(item)
+            max_in_flight.append(len(in_flight))
+        time.sleep(0.001)
+        with lock:
+            in_flight.remove(item)
+
+    list(execute_concurrently(func, range(50), max_workers=3))
+
+    assert 3 >= max(max_in_flight)
+
+
+def test_execute_concurrently__deadline__items_not_started_in_time_are_cancelled():
+    def func(item):
+        time.sleep(0.02)
+        return Deadline.current()
+
+    deadline = Deadline(0.03)
+    outcomes = list(execute_concurrently(func, range(10), max_workers=2, deadline=deadline))
+
+    started = [result for _, result, error in outcomes if error is None]
+    cancelled = [item for item, _, error in outcomes if isinstance(error, OperationCancelled)]
+
+    assert 10 == len(outcomes)
+    assert 2 <= len(started) < 10
+    assert all(result is deadline for result in started)
+    assert list(range(len(started), 10)) == cancelled
+
+
+def test_execute_concurrently__invalid_max_workers__raises_value_error():
+    with pytest.raises(ValueError):
+        list(execute_concurrently(str, range(5), max_workers=0))
+
+
+def test_rate_limiter__calls_are_spaced_out():
+    limiter = RateLimiter(rate=100)
+
+    started_at = time.monotonic()
+    for _ in range(11):
+        limiter.acquire()
+
+    assert time.monotonic() - started_at >= 0.09
@@ -0,0 +1,101 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from broker_rest_client.connections import ConnectionFilter
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+NOW = datetime(2019, 10, 15, 10, 0, 0, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.parametrize('connection_filter, expected_columns', [
+    (ConnectionFilter(), ['name']),
+    (ConnectionFilter(user='user', vhost='/'), ['name', 'user', 'vhost']),
+    (ConnectionFilter(min_idle=60, max_channels=0), ['name', 'idle_since', 'channels']),
+    (ConnectionFilter(client_properties={'product': 'pika'}), ['name', 'client_properties']),
+])
+def test_columns(connection_filter, expected_columns):
+    assert expected_columns == connection_filter.columns
+
+
+@pytest.mark.parametrize('connection_filter, expected_criteria', [
+    (ConnectionFilter(user='user', vhost='/', min_idle=60), []),
+    (ConnectionFilter(min_channels=1, max_channels=2), ['min_channels', 'max_channels']),
+    (ConnectionFilter(client_properties={'product': 'pika'}), ['client_properties']),
+])
+def test_connection_criteria(connection_filter, expected_criteria):
+    assert expected_criteria == connection_filter.connection_criteria
+
+
+@pytest.mark.parametrize('connection_filter, connection, expected', [
+    (ConnectionFilter(), {'name': 'conn'}, True),
+    (ConnectionFilter(user='user'), {'user': 'user'}, True),
+    (ConnectionFilter(user='user'), {'user': 'other'}, False),
+    (ConnectionFilter(vhost='/'), {'vhost': 'other'}, False),
+    (ConnectionFilter(min_idle=60), {'idle_since': '2019-10-15 9:58:00'}, True),
+    (ConnectionFilter(min_idle=60), {'idle_since': '2019-10-15 9:59:30'}, False),
+    (ConnectionFilter(min_idle=60), {'idle_since': None}, False),
+    (ConnectionFilter(max_channels=0), {'channels': 0}, True),
+    (ConnectionFilter(max_channels=0), {'channels': 1}, False),
+    (ConnectionFilter(min_channels=100), {'channels': 50}, False),
+    (ConnectionFilter(client_properties={'product': 'pika'}), {'client_properties': {'product': 'pika'}}, True),
+    (ConnectionFilter(client_properties={'product': 'pika'}), {'client_properties': {'product': 'java'}}, False),
+    (ConnectionFilter(client_properties={'product': 'pika'}), {}, False),
+])
+def test_matches(connection_filter, connection, expected):
+    assert expected == connection_filter.matches(connection, now=NOW)
+
+
+@pytest.fixture(params=['Europe/Berlin', 'America/New_York'])
+def local_timezone(request, monkeypatch):
+    monkeypatch.setenv('TZ', request.param)
+    time.tzset()
+
+    yield request.param
+
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize('idle_since, expected', [
+    ('2019-10-15 9:59:30', False),
+    ('2019-10-15 9:50:00', True),
+    ('2019-10-15T09:59:30.123Z', False),
+    ('2019-10-15 11:59:30+02:00', False),
+    ('2019-10-15 11:50:00+02:00', True),
+    ('2019-10-15 04:59:30-0500', False),
+])
+def test_matches__idle_since_is_read_as_utc_whatever_the_local_timezone(local_timezone, idle_since, expected):
+    assert expected == ConnectionFilter(min_idle=60).matches({'idle_since': idle_since}, now=NOW)
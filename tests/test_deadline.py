@@ -0,0 +1,156 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from broker_rest_client.deadline import Deadline, DeadlineExceeded, DeadlineRequestHandler, no_deadline
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def test_deadline__is_current_within_its_block_only():
+    assert Deadline.current() is None
+
+    with Deadline(10) as deadline:
+        assert deadline is Deadline.current()
+        assert 9 < deadline.remaining <= 10
+        assert not deadline.expired
+
+    assert Deadline.current() is None
+
+
+def test_deadline__is_not_shared_with_other_threads():
+    currents = []
+
+    with Deadline(10):
+        thread = threading.Thread(target=lambda: currents.append(Deadline.current()))
+        thread.start()
+        thread.join()
+
+    assert [None] == currents
+
+
+def test_deadline__nested_deadline_cannot_extend_the_enclosing_one():
+    with Deadline(1) as outer:
+        with Deadline(10):
+            assert outer is Deadline.current()
+
+        with Deadline(0.5) as inner:
+            assert inner is Deadline.current()
+
+
+def test_deadline__within():
+    assert Deadline.within(None) is None
+
+    with Deadline(1) as outer:
+        assert outer is Deadline.within(None)
+        assert outer is Deadline.within(10)
+        assert outer is not Deadline.within(0.5)
+
+
+def test_deadline__expired__get_timeout_raises_deadline_exceeded():
+    deadline = Deadline(0)
+
+    assert deadline.expired
+    assert 0 == deadline.remaining
+    with pytest.raises(DeadlineExceeded):
+        deadline.get_timeout()
+
+
+def test_deadline__get_timeout__is_capped_by_the_remaining_time():
+    deadline = Deadline(10)
+
+    assert 2 == deadline.get_timeout(2)
+    assert 9 < deadline.get_timeout(30) <= 10
+
+
+def test_no_deadline__lifts_the_current_deadline():
+    with Deadline(0):
+        with no_deadline():
+            assert Deadline.current() is None
+
+        assert Deadline.current() is not None
+
+
+def test_deadline_request_handler__outside_a_deadline__the_request_is_left_untouched():
+    request_handler = Mock()
+
+    DeadlineRequestHandler(request_handler).get('url', timeout=5)
+
+    request_handler.get.assert_called_once_with('url', timeout=5)
+
+
+def test_deadline_request_handler__the_remaining_time_is_split_across_requests():
+    timeouts = []
+
+    def put(url, json=None, timeout=None):
+        timeouts.append(timeout)
+        time.sleep(0.05)
+
+    request_handler = DeadlineRequestHandler(Mock(put=put))
+
+    with Deadline(1):
+        request_handler.put('user', json={})
+        request_handler.put('permissions', json={})
+
+    assert 0.9 < timeouts[0] <= 1
+    assert timeouts[1] <= timeouts[0] - 0.05
+
+
+def test_deadline_request_handler__expired__the_request_is_not_performed():
+    request_handler = Mock()
+
+    with Deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            DeadlineRequestHandler(request_handler).delete('url')
+
+    request_handler.delete.assert_not_called()
+
+
+def test_deadline_request_handler__timeout_error_after_the_deadline__raises_deadline_exceeded():
+    def get(url, timeout=None):
+        time.sleep(timeout)
+        raise IOError('read timeout')
+
+    with Deadline(0.01):
+        with pytest.raises(DeadlineExceeded):
+            DeadlineRequestHandler(Mock(get=get)).get('url')
+
+
+def test_deadline_request_handler__error_before_the_deadline__is_raised_as_is():
+    request_handler = Mock()
+    request_handler.get.side_effect = IOError('connection refused')
+
+    with Deadline(10):
+        with pytest.raises(IOError):
+            DeadlineRequestHandler(request_handler).get('url')
@@ -0,0 +1,98 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+import time
+from unittest.mock import Mock
+
+from broker_rest_client.health import HealthProbeCache, HealthCheckResult
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def make_result(checked_at=None, healthy=True):
+    return HealthCheckResult('aliveness', healthy, 0.01, checked_at or time.time())
+
+
+def test_get__fresh_result_is_served_from_the_cache():
+    cache = HealthProbeCache(ttl=10)
+    probe = Mock(return_value=make_result())
+
+    assert cache.get('key', probe) is cache.get('key', probe)
+    probe.assert_called_once_with()
+
+
+def test_get__stale_result_is_served_while_refreshed_in_the_background():
+    cache = HealthProbeCache(ttl=1, stale_ttl=10)
+    refreshed = threading.Event()
+
+    def probe():
+        refreshed.set()
+        return make_result(healthy=False)
+
+    cache.get('key', lambda: make_result(checked_at=time.time() - 5))
+
+    result = cache.get('key', probe)
+
+    assert result.stale
+    assert result.healthy
+    assert refreshed.wait(1)
+
+    time.sleep(0.01)
+    assert not cache.get('key', Mock()).healthy
+
+
+def test_get__expired_result_is_refreshed_synchronously():
+    cache = HealthProbeCache(ttl=1, stale_ttl=1)
+
+    cache.get('key', lambda: make_result(checked_at=time.time() - 5))
+    result = cache.get('key', lambda: make_result(healthy=False))
+
+    assert not result.stale
+    assert not result.healthy
+
+
+def test_get__concurrent_misses_are_coalesced():
+    cache = HealthProbeCache(ttl=10)
+    calls = []
+
+    def probe():
+        calls.append(1)
+        time.sleep(0.05)
+        return make_result()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('key', probe))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 10 == len(results)
+    assert [1] == calls
@@ -0,0 +1,146 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+from unittest.mock import Mock
+
+import pytest
+from rest_client.errors import APIError
+
+from broker_rest_client.deadline import DeadlineExceeded
+from broker_rest_client.migration import QueueMigration
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+@pytest.fixture()
+def client():
+    client = Mock()
+    client.vhost = '%2F'
+    client.get_queue_metrics = Mock(side_effect=[{'messages': 100}, {'messages': 100}, {'messages': 40},
+                                                 {'messages': 0}])
+
+    return client
+
+
+def test_run__shovels_are_created_and_deleted_once_the_source_is_empty(client):
+    progress = []
+
+    migration = QueueMigration(client, 'src', 'dst', parallel=2, prefetch_count=500, poll_interval=0,
+                               progress=lambda stats: progress.append(stats.count))
+
+    stats = migration.run()
+
+    expected_value = {
+        'src-protocol': 'amqp091',
+        'src-uri': 'amqp:///%2F',
+        'src-queue': 'src',
+        'src-prefetch-count': 500,
+        'dest-protocol': 'amqp091',
+        'dest-uri': 'amqp:///%2F',
+        'dest-queue': 'dst',
+        'ack-mode': 'on-confirm',
+    }
+    assert [('migrate-src-to-dst-0', expected_value), ('migrate-src-to-dst-1', expected_value)] == \
+        [call[0] for call in client.create_shovel.call_args_list]
+    assert [('migrate-src-to-dst-0',), ('migrate-src-to-dst-1',)] == \
+        [call[0] for call in client.delete_shovel.call_args_list]
+
+    assert [0, 60, 100] == progress
+    assert stats.completed
+    assert 100 == stats.count
+    assert 0 == stats.remaining_messages
+    client.get_queue_metrics.assert_called_with('src', columns=['name', 'messages'])
+
+
+def test_run__timeout__shovels_are_deleted_before_the_source_is_empty(client):
+    client.get_queue_metrics = Mock(return_value={'messages': 100})
+
+    stats = QueueMigration(client, 'src', 'dst', dst_uri='amqp://other/vhost', poll_interval=0, timeout=0).run()
+
+    assert not stats.completed
+    assert 'amqp://other/vhost' == client.create_shovel.call_args[0][1]['dest-uri']
+    assert 4 == client.delete_shovel.call_count
+
+
+def test_run__shovel_deletion_errors_are_reported(client):
+    client.delete_shovel = Mock(side_effect=[APIError('error', 500), None])
+
+    stats = QueueMigration(client, 'src', 'dst', parallel=2, poll_interval=0).run()
+
+    assert ['migrate-src-to-dst-0'] == [shovel for shovel, _ in stats.errors]
+    assert 2 == client.delete_shovel.call_count
+
+
+def test_run__creation_error__created_shovels_are_deleted(client):
+    client.create_shovel = Mock(side_effect=[None, APIError('error', 400)])
+
+    with pytest.raises(APIError):
+        QueueMigration(client, 'src', 'dst', parallel=2, poll_interval=0).run()
+
+    assert 2 == client.delete_shovel.call_count
+
+
+def test_run__deadline_exceeded__requested_shovels_are_deleted(client):
+    client.create_shovel = Mock(side_effect=[None, DeadlineExceeded()])
+
+    stats = QueueMigration(client, 'src', 'dst', parallel=3, poll_interval=0).run()
+
+    assert not stats.completed
+    assert [('migrate-src-to-dst-0',), ('migrate-src-to-dst-1',)] == \
+        [call[0] for call in client.delete_shovel.call_args_list]
+
+
+def test_run__missing_message_count__the_migration_waits_for_an_observed_count(client):
+    client.get_queue_metrics = Mock(side_effect=[{'name': 'src'}, {'name': 'src', 'messages': 100},
+                                                 {'name': 'src'}, {'name': 'src', 'messages': 40},
+                                                 {'name': 'src', 'messages': 0}])
+
+    stats = QueueMigration(client, 'src', 'dst', parallel=2, poll_interval=0).run()
+
+    assert stats.completed
+    assert 100 == stats.initial_messages
+    assert 100 == stats.count
+    assert 5 == client.get_queue_metrics.call_count
+    assert 2 == client.create_shovel.call_count
+
+
+def test_run__message_count_never_reported__no_shovel_is_created(client):
+    client.get_queue_metrics = Mock(return_value={'name': 'src'})
+
+    stats = QueueMigration(client, 'src', 'dst', poll_interval=0.01, timeout=0.05).run()
+
+    assert not stats.completed
+    assert stats.initial_messages is None
+    client.create_shovel.assert_not_called()
+    client.delete_shovel.assert_not_called()
+
+
+def test_parallel_should_be_positive(client):
+    with pytest.raises(ValueError):
+        QueueMigration(client, 'src', 'dst', parallel=0)
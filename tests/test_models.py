@@ -29,7 +29,8 @@ Details on EUROCONTROL: http://www.eurocontrol.int
 """
 import pytest
 
-from broker_rest_client.models import RabbitMQUserPermissions, RabbitMQUser
+from broker_rest_client.models import RabbitMQUserPermissions, RabbitMQUser, RabbitMQMessage, \
+    RabbitMQQueueSpec
 
 __author__ = "EUROCONTROL (SWIM)"
 
@@ -60,3 +61,100 @@ def test_rabbitmquserpermissions__to_json(permissions_object, expected_permissio
 ])
 def test_rabbitmquser__from_json(user_dict, expected_object):
     assert RabbitMQUser.from_json(user_dict) == expected_object
+
+
+def test_rabbitmqmessage__to_json():
+    message = RabbitMQMessage(payload='payload', routing_key='key', properties={'delivery_mode': 2})
+
+    assert {
+        'routing_key': 'key',
+        'properties': {'delivery_mode': 2},
+        'payload': 'payload',
+        'payload_encoding': 'string'
+    } == message.to_json()
+
+
+def test_rabbitmqmessage__from_json():
+    message_dict = {
+        'payload_bytes': 7,
+        'redelivered': True,
+        'exchange': 'exchange',
+        'routing_key': 'key',
+        'message_count': 3,
+        'properties': [],
+        'payload': 'payload',
+        'payload_encoding': 'string'
+    }
+
+    assert RabbitMQMessage(payload='payload', routing_key='key', exchange='exchange', redelivered=True,
+                           message_count=3) == RabbitMQMessage.from_json(message_dict)
+
+
+@pytest.mark.parametrize('spec, expected_json', [
+    (
+        RabbitMQQueueSpec(),
+        {'durable': True, 'auto_delete': False, 'arguments': {}}
+    ),
+    (
+        RabbitMQQueueSpec(durable=False, lazy=True, max_length=10, max_length_bytes=1024, overflow='reject-publish',
+                          message_ttl=60000, single_active_consumer=True, max_priority=10,
+                          arguments={'x-dead-letter-exchange': 'dlx'}),
+        {'durable': False, 'auto_delete': False, 'arguments': {
+            'x-queue-mode': 'lazy',
+            'x-max-length': 10,
+            'x-max-length-bytes': 1024,
+            'x-overflow': 'reject-publish',
+            'x-message-ttl': 60000,
+            'x-single-active-consumer': True,
+            'x-max-priority': 10,
+            'x-dead-letter-exchange': 'dlx'
+        }}
+    ),
+    (
+        RabbitMQQueueSpec.replicated_quorum(),
+        {'durable': True, 'auto_delete': False, 'arguments': {
+            'x-queue-type': 'quorum',
+            'x-overflow': 'reject-publish',
+            'x-quorum-initial-group-size': 3
+        }}
+    ),
+    (
+        RabbitMQQueueSpec.from_profile('stream-for-replay', max_length_bytes=1024),
+        {'durable': True, 'auto_delete': False, 'arguments': {
+            'x-queue-type': 'stream',
+            'x-max-length-bytes': 1024,
+            'x-max-age': '7D'
+        }}
+    ),
+])
+def test_rabbitmqqueuespec__to_json(spec, expected_json):
+    assert expected_json == spec.to_json()
+
+
+@pytest.mark.parametrize('spec', [
+    RabbitMQQueueSpec(queue_type='unknown'),
+    RabbitMQQueueSpec(overflow='unknown'),
+    RabbitMQQueueSpec(max_priority=256),
+    RabbitMQQueueSpec(queue_type='quorum', durable=False),
+    RabbitMQQueueSpec(queue_type='quorum', auto_delete=True),
+    RabbitMQQueueSpec(queue_type='quorum', lazy=True),
+    RabbitMQQueueSpec(queue_type='quorum', max_priority=10),
+    RabbitMQQueueSpec(queue_type='quorum', overflow='reject-publish-dlx'),
+    RabbitMQQueueSpec(queue_type='stream', max_length=10),
+    RabbitMQQueueSpec(queue_type='stream', message_ttl=10),
+    RabbitMQQueueSpec(queue_type='stream', single_active_consumer=True),
+])
+def test_rabbitmqqueuespec__invalid_combination__raises_value_error(spec):
+    with pytest.raises(ValueError):
+        spec.validate()
+
+
+@pytest.mark.parametrize('profile', ['high-throughput-classic', 'lazy-backlog', 'replicated-quorum',
+                                     'stream-for-replay'])
+def test_rabbitmqqueuespec__profiles_are_valid(profile):
+    RabbitMQQueueSpec.from_profile(profile).validate()
+
+
+def test_rabbitmqqueuespec__unknown_profile__raises_value_error():
+    with pytest.raises(ValueError):
+        RabbitMQQueueSpec.from_profile('unknown')
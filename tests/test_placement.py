@@ -0,0 +1,148 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from broker_rest_client.models import RabbitMQQueueSpec
+from broker_rest_client.placement import PlacementPlanner, PlacementMove, QUEUE_COLUMNS
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def make_queue(name, leader, rate=0.0, queue_type='quorum', members=None):
+    return {
+        'name': name,
+        'vhost': '/',
+        'type': queue_type,
+        'leader': leader,
+        'node': leader,
+        'members': members or ['rabbit@node1', 'rabbit@node2', 'rabbit@node3'],
+        'message_stats': {'publish_details': {'rate': rate / 2}, 'deliver_get_details': {'rate': rate / 2}}
+    }
+
+
+@pytest.fixture()
+def client():
+    client = Mock()
+    client.get_nodes = Mock(return_value=[
+        {'name': 'rabbit@node1', 'running': True},
+        {'name': 'rabbit@node2', 'running': True},
+        {'name': 'rabbit@node3', 'running': True},
+        {'name': 'rabbit@node4', 'running': False},
+    ])
+    client.get_queues = Mock(return_value=[
+        make_queue('queue1', 'rabbit@node1', rate=100),
+        make_queue('queue2', 'rabbit@node1', rate=50),
+        make_queue('queue3', 'rabbit@node1', rate=10, queue_type='classic'),
+        make_queue('queue4', 'rabbit@node2', rate=10),
+    ])
+
+    return client
+
+
+def test_get_node_loads__reads_nodes_and_queues_once(client):
+    loads = PlacementPlanner(client).get_node_loads()
+
+    assert ['rabbit@node1', 'rabbit@node2', 'rabbit@node3'] == sorted(loads)
+    assert 3 == loads['rabbit@node1'].leaders
+    assert 160 == loads['rabbit@node1'].message_rate
+    assert 0 == loads['rabbit@node3'].leaders
+
+    client.get_queues.assert_called_once_with(columns=QUEUE_COLUMNS, all_vhosts=True)
+    client.get_nodes.assert_called_once_with(columns=['name', 'running'])
+
+
+def test_recommend_node__least_loaded_running_node(client):
+    assert 'rabbit@node3' == PlacementPlanner(client).recommend_node()
+
+
+@pytest.mark.parametrize('spec, expected_argument', [
+    (None, {'x-queue-master-locator': 'min-masters'}),
+    (RabbitMQQueueSpec(queue_type='quorum'), {'x-queue-leader-locator': 'balanced'}),
+])
+def test_recommend_spec(spec, expected_argument):
+    assert expected_argument == PlacementPlanner.recommend_spec(spec).arguments
+
+
+def test_create_queue__is_placed_on_the_least_loaded_node(client):
+    node = PlacementPlanner(client).create_queue('queue', spec=RabbitMQQueueSpec(queue_type='quorum'))
+
+    assert 'rabbit@node3' == node
+    assert 'rabbit@node3' == client.create_queue.call_args[1]['node']
+    assert {'x-queue-leader-locator': 'client-local'} == client.create_queue.call_args[1]['spec'].arguments
+
+
+def test_create_queue__classic_queue__the_locator_does_not_override_the_node(client):
+    PlacementPlanner(client).create_queue('queue')
+
+    assert {'x-queue-master-locator': 'client-local'} == client.create_queue.call_args[1]['spec'].arguments
+
+
+def test_create_queue__spec_with_a_locator__raises_value_error(client):
+    spec = PlacementPlanner.recommend_spec(RabbitMQQueueSpec(queue_type='quorum'))
+
+    with pytest.raises(ValueError):
+        PlacementPlanner(client).create_queue('queue', spec=spec)
+
+    client.create_queue.assert_not_called()
+
+
+def test_plan_rebalance__moves_the_busiest_quorum_leaders_to_less_loaded_members(client):
+    moves = PlacementPlanner(client).plan_rebalance()
+
+    assert [PlacementMove('queue1', '/', 'rabbit@node1', 'rabbit@node3', 100.0)] == moves
+
+
+def test_plan_rebalance__max_moves(client):
+    client.get_queues = Mock(return_value=[make_queue(f'queue{i}', 'rabbit@node1', rate=10) for i in range(10)])
+
+    assert 2 == len(PlacementPlanner(client).plan_rebalance(max_moves=2))
+
+
+def test_plan_rebalance__leaders_are_only_moved_to_members(client):
+    client.get_queues = Mock(return_value=[
+        make_queue('queue1', 'rabbit@node1', rate=100, members=['rabbit@node1']),
+    ])
+
+    assert [] == PlacementPlanner(client).plan_rebalance()
+
+
+def test_apply_rebalance__triggers_the_broker_rebalancing_when_needed(client):
+    planner = PlacementPlanner(client)
+
+    assert planner.apply_rebalance()
+    client.rebalance_queues.assert_called_once_with()
+
+    client.get_queues = Mock(return_value=[])
+    client.rebalance_queues.reset_mock()
+
+    assert [] == planner.apply_rebalance()
+    client.rebalance_queues.assert_not_called()
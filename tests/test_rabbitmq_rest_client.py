@@ -27,13 +27,19 @@ http://opensource.org/licenses/BSD-3-Clause
 
 Details on EUROCONTROL: http://www.eurocontrol.int
 """
+import time
 from unittest.mock import Mock
 
 import pytest
 from rest_client.errors import APIError
 
-from broker_rest_client.models import RabbitMQUser, RabbitMQUserPermissions
+from broker_rest_client.cache import SharedCache
+from broker_rest_client.connections import ConnectionFilter
+from broker_rest_client.deadline import Deadline, DeadlineExceeded
+from broker_rest_client.health import HealthCheckResult
+from broker_rest_client.models import RabbitMQUser, RabbitMQUserPermissions, RabbitMQMessage, RabbitMQQueueSpec
 from broker_rest_client.rabbitmq_rest_client import RabbitMQRestClient
+from broker_rest_client.transport import JSONSerializer
 
 __author__ = "EUROCONTROL (SWIM)"
 
@@ -59,6 +65,52 @@ def test_vhost():
     assert "%2F" == client.vhost
 
 
+def test_client__with_serializer__responses_are_decoded_with_it():
+    response = Mock()
+    response.status_code = 200
+    response.content = b'{"name": "rabbitmq", "tags": ""}'
+
+    request_handler = Mock()
+    request_handler.get = Mock(return_value=response)
+
+    serializer = Mock(wraps=JSONSerializer())
+    client = RabbitMQRestClient(request_handler=request_handler, serializer=serializer)
+
+    assert RabbitMQUser(name='rabbitmq') == client.get_user('rabbitmq')
+    serializer.loads.assert_called_once_with(b'{"name": "rabbitmq", "tags": ""}')
+
+
+def test_client__within_a_deadline__every_request_gets_the_remaining_time():
+    response = Mock()
+    response.status_code = 200
+    response.content = b'[...]'
+    response.json.return_value = [{'source': 'topic', 'routing_key': 'key', 'properties_key': 'key'}]
+
+    request_handler = Mock()
+    request_handler.get = Mock(return_value=response)
+    request_handler.delete = Mock(return_value=Mock(status_code=204, content=b''))
+
+    client = RabbitMQRestClient(request_handler=request_handler)
+
+    with Deadline(5):
+        client.delete_queue_binding('queue', 'topic', 'key')
+
+    get_timeout = request_handler.get.call_args[1]['timeout']
+    delete_timeout = request_handler.delete.call_args[1]['timeout']
+    assert 0 < delete_timeout <= get_timeout <= 5
+
+
+def test_client__deadline_passed__no_request_is_performed():
+    request_handler = Mock()
+    client = RabbitMQRestClient(request_handler=request_handler)
+
+    with Deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            client.add_user('user', 'password', RabbitMQUserPermissions(configure='', write='', read=''))
+
+    request_handler.put.assert_not_called()
+
+
 def test_create_topic():
     durable, auto_delete = False, False
     topic_name = 'some topic'
@@ -92,6 +144,71 @@ def test_delete_topic():
     mock_request.assert_called_once_with('DELETE', f'api/exchanges/{client.vhost}/{topic_name}')
 
 
+@pytest.mark.parametrize('method, resource', [
+    ('get_exchanges', 'exchanges'),
+    ('get_queues', 'queues'),
+    ('get_bindings', 'bindings'),
+])
+@pytest.mark.parametrize('columns, expected_query', [
+    (None, ''),
+    (['name'], '?columns=name'),
+    (['name', 'messages'], '?columns=name,messages'),
+])
+def test_listings__columns_are_projected(method, resource, columns, expected_query):
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    getattr(client, method)(columns=columns)
+
+    mock_request.assert_called_once_with('GET', f'api/{resource}/{client.vhost}{expected_query}')
+
+
+def test_get_queues__all_vhosts():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    client.get_queues(columns=['name', 'node'], all_vhosts=True)
+
+    mock_request.assert_called_once_with('GET', 'api/queues?columns=name,node')
+
+
+@pytest.mark.parametrize('method, expected_url', [
+    ('get_users', 'api/users'),
+    ('get_permissions', 'api/vhosts/%2F/permissions'),
+    ('get_policies', 'api/policies/%2F'),
+])
+def test_get_users_permissions_and_policies(method, expected_url):
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    getattr(client, method)()
+
+    mock_request.assert_called_once_with('GET', expected_url)
+
+
+def test_get_nodes():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    client.get_nodes(columns=['name', 'running'])
+
+    mock_request.assert_called_once_with('GET', 'api/nodes?columns=name,running')
+
+
+def test_rebalance_queues():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    client.rebalance_queues()
+
+    mock_request.assert_called_once_with('POST', 'api/rebalance/queues')
+
+
 def test_get_queue():
     client = RabbitMQRestClient(request_handler=Mock())
     mock_request = Mock()
@@ -145,6 +262,67 @@ def test_create_queue_without_max_length():
     mock_request.assert_called_once_with('PUT', f'api/queues/{client.vhost}/{queue_name}', json=data)
 
 
+def test_create_queue_with_spec():
+    queue_name = 'some queue'
+
+    data = {
+        "durable": True,
+        "auto_delete": False,
+        "arguments": {
+            'x-queue-type': 'quorum',
+            'x-overflow': 'reject-publish',
+            'x-quorum-initial-group-size': 3,
+            'x-max-length': 10
+        }
+    }
+
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    client.create_queue(queue_name, max_length=10, spec=RabbitMQQueueSpec.replicated_quorum())
+
+    mock_request.assert_called_once_with('PUT', f'api/queues/{client.vhost}/{queue_name}', json=data)
+
+
+def test_create_queue_with_invalid_spec__raises_value_error():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    with pytest.raises(ValueError):
+        client.create_queue('queue', spec=RabbitMQQueueSpec(queue_type='quorum', lazy=True))
+
+    mock_request.assert_not_called()
+
+
+@pytest.mark.parametrize('max_length, spec', [
+    (5, RabbitMQQueueSpec.stream_for_replay()),
+    (5, RabbitMQQueueSpec(max_length=10)),
+])
+def test_create_queue_with_spec__max_length_not_supported_by_the_spec__raises_value_error(max_length, spec):
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    with pytest.raises(ValueError):
+        client.create_queue('queue', max_length=max_length, spec=spec)
+
+    mock_request.assert_not_called()
+
+
+def test_create_queue_on_node():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    client.create_queue('queue', node='rabbit@node1')
+
+    mock_request.assert_called_once_with('PUT', f'api/queues/{client.vhost}/queue',
+                                         json={'durable': False, 'auto_delete': False, 'arguments': {},
+                                               'node': 'rabbit@node1'})
+
+
 def test_delete_queue():
     client = RabbitMQRestClient(request_handler=Mock())
     mock_request = Mock()
@@ -157,6 +335,26 @@ def test_delete_queue():
     mock_request.assert_called_once_with('DELETE', f'api/queues/{client.vhost}/{queue_name}')
 
 
+def test_delete_queue_if_empty():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    client.delete_queue('queue', if_empty=True)
+
+    mock_request.assert_called_once_with('DELETE', f'api/queues/{client.vhost}/queue?if-empty=true')
+
+
+def test_purge_queue():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    client.purge_queue('some queue')
+
+    mock_request.assert_called_once_with('DELETE', f'api/queues/{client.vhost}/some queue/contents')
+
+
 @pytest.mark.parametrize('topic_name, expected_topic_name', [
     ('default', 'amq.topic'),
     ('any_other_topic_name', 'any_other_topic_name')
@@ -419,3 +617,428 @@ def test_create_policy(name, pattern, priority, apply_to, definitions, expected_
     client.create_policy(name, pattern, priority, apply_to, definitions=definitions)
 
     mock_request.assert_called_once_with('PUT', f'api/policies/{client.vhost}/{name}', json=expected_data)
+
+
+@pytest.mark.parametrize('exchange, expected_exchange, response, expected_routed', [
+    ('default', 'amq.topic', {'routed': True}, True),
+    ('any_other_exchange', 'any_other_exchange', {'routed': False}, False)
+])
+def test_publish(exchange, expected_exchange, response, expected_routed):
+    client = RabbitMQRestClient(request_handler=Mock())
+
+    mock_request = Mock(return_value=response)
+    client.perform_request = mock_request
+
+    message = RabbitMQMessage(payload='payload', routing_key='key')
+
+    assert expected_routed == client.publish(exchange, message)
+
+    mock_request.assert_called_once_with('POST',
+                                         f'api/exchanges/{client.vhost}/{expected_exchange}/publish',
+                                         json={'routing_key': 'key', 'properties': {}, 'payload': 'payload',
+                                               'payload_encoding': 'string'})
+
+
+def test_publish_many__reports_published_unroutable_and_failed_messages():
+    client = RabbitMQRestClient(request_handler=Mock())
+
+    def perform_request(method, url, json=None):
+        if json['payload'] == 'fail':
+            raise APIError('error', 500)
+        return {'routed': json['routing_key'] == 'routed'}
+
+    client.perform_request = perform_request
+
+    messages = [RabbitMQMessage(payload='ok', routing_key='routed') for _ in range(10)] + \
+               [RabbitMQMessage(payload='ok', routing_key='unroutable'),
+                RabbitMQMessage(payload='fail', routing_key='routed')]
+
+    stats = client.publish_many('exchange', iter(messages), concurrency=4)
+
+    assert 11 == stats.count
+    assert [messages[10]] == stats.unroutable
+    assert [messages[11]] == [message for message, _ in stats.errors]
+    assert stats.finished_at is not None
+
+
+def test_publish_many__timeout__messages_not_published_in_time_are_cancelled():
+    client = RabbitMQRestClient(request_handler=Mock())
+    client.perform_request = Mock(side_effect=lambda method, url, json=None: time.sleep(0.02) or {'routed': True})
+
+    messages = [RabbitMQMessage(payload=str(index)) for index in range(10)]
+
+    stats = client.publish_many('exchange', messages, concurrency=2, timeout=0.03)
+
+    assert 10 == stats.count + len(stats.cancelled)
+    assert 2 <= stats.count < 10
+    assert messages[stats.count:] == stats.cancelled
+
+
+def test_get_messages__messages_are_retrieved_in_chunks():
+    client = RabbitMQRestClient(request_handler=Mock())
+
+    message = {'payload': 'payload', 'payload_encoding': 'string', 'routing_key': 'key', 'exchange': 'exchange',
+               'redelivered': False, 'message_count': 0, 'properties': {}}
+    mock_request = Mock(side_effect=[[message] * 2, [message] * 2, [message]])
+    client.perform_request = mock_request
+
+    messages = list(client.get_messages('queue', count=10, chunk_size=2))
+
+    assert 5 == len(messages)
+    assert RabbitMQMessage.from_json(message) == messages[0]
+    assert 3 == mock_request.call_count
+    mock_request.assert_called_with('POST', f'api/queues/{client.vhost}/queue/get',
+                                    json={'count': 2, 'ackmode': 'ack_requeue_false', 'encoding': 'auto'})
+
+
+def test_get_messages__requeued_messages_are_retrieved_in_one_request():
+    client = RabbitMQRestClient(request_handler=Mock())
+
+    mock_request = Mock(return_value=[])
+    client.perform_request = mock_request
+
+    assert [] == list(client.get_messages('queue', count=10, ackmode='ack_requeue_true', truncate=100, chunk_size=2))
+
+    mock_request.assert_called_once_with('POST', f'api/queues/{client.vhost}/queue/get',
+                                         json={'count': 10, 'ackmode': 'ack_requeue_true', 'encoding': 'auto',
+                                               'truncate': 100})
+
+
+def test_cache__reads_are_served_from_the_cache_until_a_write_invalidates_them(tmp_path):
+    client = RabbitMQRestClient(request_handler=Mock(base_url='https://broker:15672/'),
+                                cache=SharedCache(path=str(tmp_path / 'cache.sqlite3')))
+
+    mock_request = Mock(return_value={'name': 'queue'})
+    client.perform_request = mock_request
+
+    assert {'name': 'queue'} == client.get_queue('queue')
+    assert {'name': 'queue'} == client.get_queue('queue')
+    assert 1 == mock_request.call_count
+
+    client.delete_queue('queue')
+    client.get_queue('queue')
+
+    assert 3 == mock_request.call_count
+
+
+def test_cache__writes_from_another_client_invalidate_the_shared_entries(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    client1 = RabbitMQRestClient(request_handler=Mock(base_url='https://broker:15672/'), cache=SharedCache(path=path))
+    client2 = RabbitMQRestClient(request_handler=Mock(base_url='https://broker:15672/'), cache=SharedCache(path=path))
+
+    client1.perform_request = Mock(return_value=[{'source': 'topic', 'routing_key': 'key'}])
+    client2.perform_request = Mock(return_value=[{'source': 'topic', 'routing_key': 'key'}])
+
+    client1.get_queue_bindings('queue')
+    client2.get_queue_bindings('queue')
+    client2.perform_request.assert_not_called()
+
+    client1.bind_queue_to_topic('queue', 'other_key', 'topic')
+    client2.get_queue_bindings('queue')
+    client2.perform_request.assert_called_once_with('GET', f'api/queues/{client2.vhost}/queue/bindings')
+
+
+def test_cache__entries_of_different_brokers_do_not_overlap(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    client1 = RabbitMQRestClient(request_handler=Mock(base_url='https://broker1:15672/'), cache=SharedCache(path=path))
+    client2 = RabbitMQRestClient(request_handler=Mock(host='broker2:15672'), cache=SharedCache(path=path))
+
+    client1.perform_request = Mock(return_value={'name': 'queue', 'messages': 1})
+    client2.perform_request = Mock(return_value={'name': 'queue', 'messages': 2})
+
+    assert 1 == client1.get_queue('queue')['messages']
+    assert 2 == client2.get_queue('queue')['messages']
+
+
+def test_cache__unknown_broker_and_no_namespace__raises_value_error(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+
+    with pytest.raises(ValueError):
+        RabbitMQRestClient(request_handler=Mock(), cache=SharedCache(path=path))
+
+    RabbitMQRestClient(request_handler=Mock(), cache=SharedCache(path=path, namespace='broker1'))
+
+
+def test_cache__get_user(tmp_path):
+    client = RabbitMQRestClient(request_handler=Mock(base_url='https://broker:15672/'),
+                                cache=SharedCache(path=str(tmp_path / 'cache.sqlite3')))
+
+    mock_request = Mock(return_value={'name': 'rabbitmq', 'tags': ''})
+    client.perform_request = mock_request
+
+    assert client.user_exists('rabbitmq')
+    assert RabbitMQUser(name='rabbitmq') == client.get_user('rabbitmq')
+    mock_request.assert_called_once_with('GET', 'api/users/rabbitmq')
+
+
+def test_create_sharded_queue():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    client.create_sharded_queue('orders', shards=2, weights=[1, 3])
+
+    calls = {(call[0][0], call[0][1]): call[1]['json'] for call in mock_request.call_args_list}
+
+    assert {
+        ('PUT', 'api/exchanges/%2F/orders'),
+        ('PUT', 'api/queues/%2F/orders.0'),
+        ('PUT', 'api/queues/%2F/orders.1'),
+        ('POST', 'api/bindings/%2F/e/orders/q/orders.0'),
+        ('POST', 'api/bindings/%2F/e/orders/q/orders.1'),
+    } == set(calls)
+    assert 'x-consistent-hash' == calls[('PUT', 'api/exchanges/%2F/orders')]['type']
+    assert '1' == calls[('POST', 'api/bindings/%2F/e/orders/q/orders.0')]['routing_key']
+    assert '3' == calls[('POST', 'api/bindings/%2F/e/orders/q/orders.1')]['routing_key']
+
+
+def test_create_sharded_queue__failure__raises_api_error():
+    client = RabbitMQRestClient(request_handler=Mock())
+    client.perform_request = Mock(side_effect=APIError('error', 404))
+
+    with pytest.raises(APIError):
+        client.create_sharded_queue('orders', shards=2)
+
+
+def test_resize_sharded_queue():
+    client = RabbitMQRestClient(request_handler=Mock())
+    client.get_exchange_bindings = Mock(return_value=[
+        {'destination': 'orders.0', 'destination_type': 'queue', 'routing_key': '1', 'properties_key': '1'},
+        {'destination': 'orders.1', 'destination_type': 'queue', 'routing_key': '1', 'properties_key': '1'},
+        {'destination': 'orders.2', 'destination_type': 'queue', 'routing_key': '1', 'properties_key': '1'},
+        {'destination': 'orders.3', 'destination_type': 'queue', 'routing_key': '1', 'properties_key': '1'},
+    ])
+
+    def perform_request(method, url, json=None):
+        if url == 'api/queues/%2F/orders.3?if-empty=true':
+            raise APIError('not empty', 400)
+
+    client.perform_request = Mock(side_effect=perform_request)
+
+    result = client.resize_sharded_queue('orders', shards=2, weights=[1, 2])
+
+    assert [] == result.added
+    assert ['orders.1'] == result.reweighted
+    assert ['orders.2'] == result.removed
+    assert ['orders.3'] == result.retained
+
+    called = [call[0][:2] for call in client.perform_request.call_args_list]
+    assert [
+        ('POST', 'api/bindings/%2F/e/orders/q/orders.1'),
+        ('DELETE', 'api/bindings/%2F/e/orders/q/orders.1/1'),
+        ('DELETE', 'api/bindings/%2F/e/orders/q/orders.2/1'),
+        ('DELETE', 'api/queues/%2F/orders.2?if-empty=true'),
+        ('DELETE', 'api/bindings/%2F/e/orders/q/orders.3/1'),
+        ('DELETE', 'api/queues/%2F/orders.3?if-empty=true'),
+    ] == called
+
+
+def test_get_sharded_queue_distribution():
+    client = RabbitMQRestClient(request_handler=Mock())
+    client.get_exchange_bindings = Mock(return_value=[
+        {'destination': 'orders.0', 'destination_type': 'queue'},
+        {'destination': 'orders.1', 'destination_type': 'queue'},
+    ])
+    client.get_queues = Mock(return_value=[
+        {'name': 'orders.0', 'messages': 30},
+        {'name': 'orders.1', 'messages': 10},
+        {'name': 'other', 'messages': 100},
+    ])
+
+    distribution = client.get_sharded_queue_distribution('orders')
+
+    assert {'orders.0': 30, 'orders.1': 10} == distribution.depths
+    assert 1.5 == distribution.skew
+    client.get_queues.assert_called_once_with(columns=['name', 'messages'])
+
+
+def test_get_queue_metrics():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    client.get_queue_metrics('queue', columns=['name', 'messages'])
+
+    mock_request.assert_called_once_with('GET', f'api/queues/{client.vhost}/queue?columns=name,messages')
+
+
+def test_create_shovel():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    client.create_shovel('shovel', {'src-queue': 'src'})
+
+    mock_request.assert_called_once_with('PUT', f'api/parameters/shovel/{client.vhost}/shovel',
+                                         json={'value': {'src-queue': 'src'}})
+
+
+def test_delete_shovel():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock()
+    client.perform_request = mock_request
+
+    client.delete_shovel('shovel')
+
+    mock_request.assert_called_once_with('DELETE', f'api/parameters/shovel/{client.vhost}/shovel')
+
+
+def test_iter_connections__pages_are_fetched_lazily():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock(side_effect=[
+        {'items': [{'name': 'conn1'}, {'name': 'conn2'}], 'page_count': 2},
+        {'items': [{'name': 'conn3'}], 'page_count': 2},
+    ])
+    client.perform_request = mock_request
+
+    connections = client.iter_connections(columns=['name'], page_size=2)
+
+    assert {'name': 'conn1'} == next(connections)
+    assert 1 == mock_request.call_count
+
+    assert [{'name': 'conn2'}, {'name': 'conn3'}] == list(connections)
+    assert [
+        ('GET', 'api/connections?page=1&page_size=2&columns=name'),
+        ('GET', 'api/connections?page=2&page_size=2&columns=name'),
+    ] == [call[0] for call in mock_request.call_args_list]
+
+
+def test_iter_channels__filter_is_applied_and_its_columns_are_requested():
+    client = RabbitMQRestClient(request_handler=Mock())
+    mock_request = Mock(return_value={'items': [{'name': 'ch1', 'user': 'user'}, {'name': 'ch2', 'user': 'other'}],
+                                      'page_count': 1})
+    client.perform_request = mock_request
+
+    channels = list(client.iter_channels(ConnectionFilter(user='user'), columns=['name', 'number']))
+
+    assert [{'name': 'ch1', 'user': 'user'}] == channels
+    mock_request.assert_called_once_with('GET', 'api/channels?page=1&page_size=500&columns=name,number,user')
+
+
+@pytest.mark.parametrize('channel_filter', [
+    ConnectionFilter(min_channels=1),
+    ConnectionFilter(max_channels=0),
+    ConnectionFilter(user='user', client_properties={'product': 'pika'}),
+])
+def test_iter_channels__connection_criteria__raises_value_error(channel_filter):
+    client = RabbitMQRestClient(request_handler=Mock())
+    client.perform_request = Mock()
+
+    with pytest.raises(ValueError):
+        client.iter_channels(channel_filter)
+
+    client.perform_request.assert_not_called()
+
+
+def test_close_connection__reason_is_sent_as_header():
+    response = Mock()
+    response.status_code = 204
+    response.content = b''
+
+    request_handler = Mock()
+    request_handler.delete = Mock(return_value=response)
+
+    client = RabbitMQRestClient(request_handler=request_handler)
+
+    client.close_connection('127.0.0.1:52044 -> 127.0.0.1:5672', reason='leaked')
+
+    request_handler.delete.assert_called_once_with('api/connections/127.0.0.1%3A52044%20-%3E%20127.0.0.1%3A5672',
+                                                   headers={'X-Reason': 'leaked'})
+
+
+@pytest.mark.parametrize('error_code', [400, 401, 403, 404, 500])
+def test_close_connection__http_error_code__raises_api_error(error_code):
+    response = Mock()
+    response.status_code = error_code
+
+    request_handler = Mock()
+    request_handler.delete = Mock(return_value=response)
+
+    client = RabbitMQRestClient(request_handler=request_handler)
+
+    with pytest.raises(APIError):
+        client.close_connection('conn', reason='leaked')
+
+
+def test_close_connections():
+    client = RabbitMQRestClient(request_handler=Mock())
+    client.iter_connections = Mock(return_value=iter([{'name': f'conn{i}'} for i in range(10)]))
+
+    def close_connection(name, reason):
+        if name == 'conn3':
+            raise APIError('error', 404)
+
+    client.close_connection = Mock(side_effect=close_connection)
+
+    connection_filter = ConnectionFilter(user='user', max_channels=0)
+    stats = client.close_connections(connection_filter, reason='idle', concurrency=4, rate_limit=1000)
+
+    assert 9 == stats.count
+    assert ['conn3'] == [name for name, _ in stats.errors]
+    assert 10 == client.close_connection.call_count
+    client.iter_connections.assert_called_once_with(connection_filter, columns=['name'])
+
+
+@pytest.mark.parametrize('method, expected_url', [
+    ('check_aliveness', 'api/aliveness-test/%2F'),
+    ('check_alarms', 'api/health/checks/alarms'),
+    ('check_local_alarms', 'api/health/checks/local-alarms'),
+    ('check_virtual_hosts', 'api/health/checks/virtual-hosts'),
+    ('check_node_is_quorum_critical', 'api/health/checks/node-is-quorum-critical'),
+])
+def test_health_checks__results_are_cached(method, expected_url):
+    response = Mock()
+    response.status_code = 200
+    response.content = b'{"status": "ok"}'
+    response.json = Mock(return_value={'status': 'ok'})
+
+    request_handler = Mock()
+    request_handler.get = Mock(return_value=response)
+
+    client = RabbitMQRestClient(request_handler=request_handler)
+
+    result = getattr(client, method)(timeout=1)
+    getattr(client, method)(timeout=1)
+
+    assert result.healthy
+    assert 200 == result.status_code
+    request_handler.get.assert_called_once_with(expected_url, timeout=1)
+
+
+@pytest.mark.parametrize('status_code, body, expected_healthy', [
+    (200, {'status': 'ok'}, True),
+    (503, {'status': 'failed', 'reason': 'alarms in effect'}, False),
+    (500, None, False),
+])
+def test_health_check__status(status_code, body, expected_healthy):
+    response = Mock()
+    response.status_code = status_code
+    response.content = b'body' if body else b''
+    response.json = Mock(return_value=body)
+
+    request_handler = Mock()
+    request_handler.get = Mock(return_value=response)
+
+    client = RabbitMQRestClient(request_handler=request_handler)
+
+    assert expected_healthy == client.check_alarms().healthy
+
+
+def test_health_check__request_error__is_unhealthy():
+    request_handler = Mock()
+    request_handler.get = Mock(side_effect=ConnectionError('timeout'))
+
+    client = RabbitMQRestClient(request_handler=request_handler)
+
+    result = client.check_aliveness()
+
+    assert not result.healthy
+    assert result.status_code is None
+    assert 'timeout' == result.details
+
+
+def test_check_health():
+    client = RabbitMQRestClient(request_handler=Mock())
+    client._probe = Mock(side_effect=lambda name, url, timeout: HealthCheckResult(name, True, 0.01, time.time()))
+
+    assert ['aliveness', 'alarms', 'local-alarms', 'virtual-hosts'] == [result.name for result in client.check_health()]
@@ -0,0 +1,70 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import pytest
+
+from broker_rest_client.sharding import get_shard_name, get_shard_weights, ShardDistribution
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def test_get_shard_name():
+    assert 'queue.3' == get_shard_name('queue', 3)
+
+
+@pytest.mark.parametrize('shards, weights, expected_weights', [
+    (1, None, {0: 1}),
+    (3, None, {0: 1, 1: 1, 2: 1}),
+    (2, [1, 4], {0: 1, 1: 4}),
+])
+def test_get_shard_weights(shards, weights, expected_weights):
+    assert expected_weights == get_shard_weights(shards, weights)
+
+
+@pytest.mark.parametrize('shards, weights', [
+    (0, None),
+    (2, [1]),
+    (2, [1, 0]),
+])
+def test_get_shard_weights__invalid_input__raises_value_error(shards, weights):
+    with pytest.raises(ValueError):
+        get_shard_weights(shards, weights)
+
+
+@pytest.mark.parametrize('depths, expected_total, expected_skew', [
+    ({}, 0, 1.0),
+    ({'queue.0': 0, 'queue.1': 0}, 0, 1.0),
+    ({'queue.0': 10, 'queue.1': 10}, 20, 1.0),
+    ({'queue.0': 30, 'queue.1': 10}, 40, 1.5),
+])
+def test_shard_distribution(depths, expected_total, expected_skew):
+    distribution = ShardDistribution(depths)
+
+    assert expected_total == distribution.total
+    assert expected_skew == distribution.skew
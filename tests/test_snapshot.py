@@ -0,0 +1,149 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from broker_rest_client.snapshot import TopologySnapshot, _HEADER, _SECTION
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+@pytest.fixture()
+def client():
+    client = Mock()
+    client.vhost = '%2F'
+    client.get_exchanges = Mock(return_value=[
+        {'name': 'topic', 'type': 'topic', 'durable': True, 'auto_delete': False, 'internal': False, 'arguments': {}},
+    ])
+    client.get_queues = Mock(return_value=[
+        {'name': 'queue1', 'type': 'classic', 'durable': True, 'auto_delete': False, 'arguments': {}},
+        {'name': 'queue2', 'type': 'quorum', 'durable': True, 'auto_delete': False,
+         'arguments': {'x-queue-type': 'quorum'}},
+    ])
+    client.get_bindings = Mock(return_value=[
+        {'source': 'topic', 'destination': 'queue1', 'destination_type': 'queue', 'routing_key': 'key1',
+         'arguments': {}},
+        {'source': 'topic', 'destination': 'queue2', 'destination_type': 'queue', 'routing_key': 'key2',
+         'arguments': {}},
+        {'source': 'topic', 'destination': 'queue1', 'destination_type': 'queue', 'routing_key': 'key2',
+         'arguments': {}},
+    ])
+    client.get_users = Mock(return_value=[{'name': 'user', 'tags': ['administrator', 'management']}])
+    client.get_permissions = Mock(return_value=[
+        {'user': 'user', 'vhost': '/', 'configure': '.*', 'write': '.*', 'read': ''},
+    ])
+    client.get_policies = Mock(return_value=[
+        {'name': 'policy', 'pattern': '.*', 'apply-to': 'queues', 'priority': 1,
+         'definition': {'max-length': 100}},
+    ])
+
+    return client
+
+
+def assert_snapshot(snapshot):
+    assert '/' == snapshot.vhost
+    assert 9 == len(snapshot)
+
+    assert {'name': 'topic', 'type': 'topic', 'arguments': {}, 'durable': True, 'auto_delete': False,
+            'internal': False} == snapshot.get_exchange('topic')
+    assert {'name': 'queue2', 'type': 'quorum', 'arguments': {'x-queue-type': 'quorum'}, 'durable': True,
+            'auto_delete': False} == snapshot.get_queue('queue2')
+    assert snapshot.get_queue('unknown') is None
+
+    assert ['key1', 'key2'] == [b['routing_key'] for b in snapshot.get_bindings_by_queue('queue1')]
+    assert ['queue1', 'queue2', 'queue1'] == [b['destination'] for b in snapshot.get_bindings_by_exchange('topic')]
+
+    assert {'name': 'user', 'tags': 'administrator,management'} == next(snapshot.iter_rows('users'))
+    assert {'user': 'user', 'configure': '.*', 'write': '.*', 'read': ''} == snapshot.get_user_permissions('user')
+    assert {'name': 'policy', 'pattern': '.*', 'apply-to': 'queues', 'priority': 1,
+            'definition': {'max-length': 100}} == next(snapshot.iter_rows('policies'))
+
+
+def test_from_client(client):
+    assert_snapshot(TopologySnapshot.from_client(client))
+
+
+def test_strings_are_interned(client):
+    snapshot = TopologySnapshot.from_client(client)
+
+    assert len(set(snapshot.strings[i] for i in range(len(snapshot.strings)))) == len(snapshot.strings)
+
+
+def test_save_and_load(client, tmp_path):
+    path = str(tmp_path / 'topology.snap')
+
+    TopologySnapshot.from_client(client).save(path)
+
+    snapshot = TopologySnapshot.load(path)
+
+    assert_snapshot(snapshot)
+
+    with pytest.raises(ValueError):
+        snapshot.extend('queues', [{'name': 'queue3'}])
+
+
+def test_save__payloads_are_8_bytes_aligned(client, tmp_path):
+    path = str(tmp_path / 'topology.snap')
+    TopologySnapshot.from_client(client).save(path)
+
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    position = _HEADER.size
+    while position < len(content):
+        name_length, name, typecode, size = _SECTION.unpack_from(content, position)
+        position += _SECTION.size
+
+        assert 0 == position % 8, name[:name_length]
+        position += size + -size % 8
+
+
+def test_load__as_context_manager__the_file_is_unmapped_on_exit(client, tmp_path):
+    path = str(tmp_path / 'topology.snap')
+    TopologySnapshot.from_client(client).save(path)
+
+    with TopologySnapshot.load(path) as snapshot:
+        assert_snapshot(snapshot)
+        mapped = snapshot._mmap
+
+    assert mapped.closed
+    with pytest.raises(ValueError):
+        snapshot.get_queue('queue1')
+
+    snapshot.close()
+
+
+def test_load__not_a_snapshot__raises_value_error(tmp_path):
+    path = tmp_path / 'topology.snap'
+    path.write_bytes(b'0' * 64)
+
+    with pytest.raises(ValueError):
+        TopologySnapshot.load(str(path))
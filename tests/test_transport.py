@@ -0,0 +1,111 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import gzip
+from unittest.mock import Mock
+
+import pytest
+
+from broker_rest_client.transport import TransportRequestHandler, JSONSerializer, get_fastest_serializer
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+@pytest.mark.parametrize('serializer', [JSONSerializer(), get_fastest_serializer()])
+def test_serializer__roundtrip(serializer):
+    data = {'name': 'queue', 'arguments': {'x-max-length': 10}, 'tags': ['é']}
+
+    assert data == serializer.loads(serializer.dumps(data))
+
+
+def test_transport_request_handler__accept_encoding_is_negotiated():
+    request_handler = Mock()
+    request_handler.headers = {}
+
+    TransportRequestHandler(request_handler)
+
+    assert 'gzip, deflate' == request_handler.headers['Accept-Encoding']
+
+
+def test_transport_request_handler__json_body_is_encoded_with_serializer():
+    request_handler = Mock()
+    handler = TransportRequestHandler(request_handler)
+
+    handler.put('api/queues/%2F/queue', json={'durable': True})
+
+    request_handler.put.assert_called_once_with('api/queues/%2F/queue',
+                                                data=b'{"durable":true}',
+                                                headers={'Content-Type': 'application/json'})
+
+
+def test_transport_request_handler__large_body_is_compressed():
+    request_handler = Mock()
+    handler = TransportRequestHandler(request_handler, compress_threshold=10)
+
+    handler.post('api/definitions', json={'queues': ['queue'] * 10})
+
+    kwargs = request_handler.post.call_args[1]
+    assert 'gzip' == kwargs['headers']['Content-Encoding']
+    assert {'queues': ['queue'] * 10} == JSONSerializer().loads(gzip.decompress(kwargs['data']))
+
+
+def test_transport_request_handler__small_body_is_not_compressed():
+    request_handler = Mock()
+    handler = TransportRequestHandler(request_handler, compress_threshold=1000)
+
+    handler.post('api/definitions', json={'queues': []})
+
+    assert 'Content-Encoding' not in request_handler.post.call_args[1]['headers']
+
+
+def test_transport_request_handler__request_without_body_is_passed_through():
+    request_handler = Mock()
+    handler = TransportRequestHandler(request_handler)
+
+    handler.delete('api/queues/%2F/queue')
+
+    request_handler.delete.assert_called_once_with('api/queues/%2F/queue')
+
+
+def test_transport_request_handler__response_is_decoded_with_serializer():
+    response = Mock()
+    response.status_code = 200
+    response.content = b'[{"name": "queue"}]'
+
+    request_handler = Mock()
+    request_handler.get = Mock(return_value=response)
+
+    serializer = Mock(wraps=JSONSerializer())
+    handler = TransportRequestHandler(request_handler, serializer=serializer)
+
+    result = handler.get('api/queues')
+
+    assert 200 == result.status_code
+    assert [{'name': 'queue'}] == result.json()
+    serializer.loads.assert_called_once_with(b'[{"name": "queue"}]')
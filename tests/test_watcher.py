@@ -0,0 +1,129 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the 
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following 
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following 
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products 
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, 
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, 
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE 
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative: 
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+from unittest.mock import Mock
+
+from broker_rest_client.watcher import TopologyWatcher, TopologyEvent, DEFAULT_COLUMNS
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def make_client(queues, exchanges=None, bindings=None):
+    client = Mock()
+    client.get_queues = Mock(side_effect=queues)
+    client.get_exchanges = Mock(return_value=exchanges or [])
+    client.get_bindings = Mock(return_value=bindings or [])
+
+    return client
+
+
+def test_poll__listings_are_restricted_to_the_watched_columns():
+    client = make_client(queues=[[]])
+
+    TopologyWatcher(client).poll()
+
+    client.get_queues.assert_called_once_with(columns=DEFAULT_COLUMNS['queue'])
+    client.get_exchanges.assert_called_once_with(columns=DEFAULT_COLUMNS['exchange'])
+    client.get_bindings.assert_called_once_with(columns=DEFAULT_COLUMNS['binding'])
+
+
+def test_poll__only_differences_are_emitted():
+    queue1 = {'name': 'queue1', 'durable': True}
+    queue2 = {'name': 'queue2', 'durable': True}
+    queue2_changed = {'name': 'queue2', 'durable': False}
+    queue3 = {'name': 'queue3', 'durable': True}
+
+    client = make_client(queues=[[queue1, queue2], [queue1, queue2], [queue2_changed, queue3]])
+    watcher = TopologyWatcher(client, object_types=['queue'])
+
+    assert [TopologyEvent('added', 'queue', 'queue1', queue1),
+            TopologyEvent('added', 'queue', 'queue2', queue2)] == watcher.poll()
+
+    assert [] == watcher.poll()
+
+    assert [TopologyEvent('changed', 'queue', 'queue2', queue2_changed),
+            TopologyEvent('added', 'queue', 'queue3', queue3),
+            TopologyEvent('removed', 'queue', 'queue1')] == watcher.poll()
+
+
+def test_poll__bindings_are_keyed_by_source_destination_and_properties_key():
+    binding = {'source': 'topic', 'destination': 'queue', 'destination_type': 'queue', 'routing_key': 'key',
+               'arguments': {}, 'properties_key': 'key'}
+
+    client = make_client(queues=[], bindings=[binding])
+    watcher = TopologyWatcher(client, object_types=['binding'])
+
+    assert [TopologyEvent('added', 'binding', ('topic', 'queue', 'queue', 'key'), binding)] == watcher.poll()
+
+
+def test_start__subscribers_receive_events_from_the_polling_thread():
+    received = threading.Event()
+    events = []
+
+    def callback(new_events):
+        events.extend(new_events)
+        received.set()
+
+    client = Mock()
+    client.get_queues = Mock(return_value=[{'name': 'queue'}])
+
+    watcher = TopologyWatcher(client, interval=0.01, object_types=['queue'])
+    watcher.subscribe(callback)
+
+    with watcher:
+        assert received.wait(1)
+
+    assert [TopologyEvent('added', 'queue', 'queue', {'name': 'queue'})] == events
+
+
+def test_start__a_failing_subscriber_does_not_stop_the_others_nor_the_polling_thread():
+    received = threading.Event()
+    events = []
+
+    def callback(new_events):
+        events.append(new_events)
+        if len(events) == 2:
+            received.set()
+
+    client = Mock()
+    client.get_queues = Mock(side_effect=[[{'name': 'queue1'}], [{'name': 'queue1'}, {'name': 'queue2'}]] + [[]] * 100)
+
+    failing = Mock(side_effect=ValueError())
+    watcher = TopologyWatcher(client, interval=0.01, object_types=['queue'])
+    watcher.subscribe(failing)
+    watcher.subscribe(callback)
+
+    with watcher:
+        assert received.wait(1)
+        assert watcher._thread.is_alive()
+
+    assert [TopologyEvent('added', 'queue', 'queue1', {'name': 'queue1'})] == events[0]
+    assert [TopologyEvent('added', 'queue', 'queue2', {'name': 'queue2'})] == events[1]
+    assert 2 <= failing.call_count